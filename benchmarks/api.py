@@ -0,0 +1,237 @@
+"""
+Навантажувальний бенчмарк API.
+
+Запускає застосунок у тому ж процесі через ``httpx.AsyncClient`` на SQLite (тимчасовий файл за замовчуванням)
+або на локальному Postgres зі схемою після міграцій, наповнює базу ``--accounts`` обліковими записами
+з ``--users`` контактами в кожному та вимірює пропускну здатність і p50/p95/p99 для кожної операції
+за заданої конкурентності. Обмеження частоти запитів на час бенчмарку вимикається.
+Запуск: ``python -m benchmarks.api --accounts 10 --users 100 --requests 200 --concurrency 16 --output api.json``.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+import uuid
+
+import httpx
+
+OPERATIONS = ("signup", "login", "refresh", "list", "get", "create", "update", "delete")
+PASSWORD = "password"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    index = max(0, math.ceil(q / 100 * len(samples)) - 1)
+    return samples[index]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, concurrency: int) -> dict:
+    latencies.sort()
+    total = len(latencies) + errors
+    result = {
+        "requests": total,
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else None,
+    }
+    if latencies:
+        result.update({
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+        })
+    return result
+
+
+def user_body(i: int) -> dict:
+    return {
+        "first_name": "Bench",
+        "last_name": f"User{i:06d}",
+        "email": f"user{i}@example.com",
+        "phone_number": f"+380{i:09d}",
+        "birthday": "01.01.1990",
+        "data": bool(i % 2),
+    }
+
+
+async def measure(request, requests: int, concurrency: int) -> dict:
+    """
+    Виконати ``requests`` запитів ``concurrency`` паралельними виконавцями.
+
+    :param request: Корутина ``request(i, worker)``, яка повертає ``httpx.Response``.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker(w: int):
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await request(i, w)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started, concurrency)
+
+
+async def seed(run_id: str, accounts: int, users: int, create_schema: bool) -> list[dict]:
+    """
+    Створити підтверджені облікові записи з контактами безпосередньо в базі даних.
+
+    :return: Облікові записи з email та ідентифікаторами їхніх контактів.
+    """
+    from sqlalchemy import insert
+
+    from src.database.db import Base, sessionmanager
+    from src.database.models import Account, User
+    from src.services.auth import auth_service
+
+    if create_schema:
+        async with sessionmanager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    password = auth_service.get_password_hash(PASSWORD)
+    seeded = []
+    async with sessionmanager.session() as db:
+        acc_ids = (await db.scalars(insert(Account).returning(Account.id, sort_by_parameter_order=True), [
+            {"username": f"b{run_id}{i}", "email": f"bench-{run_id}-{i}@example.com", "password": password,
+             "avatar": "", "confirmed": True}
+            for i in range(accounts)
+        ])).all()
+        for i, acc_id in enumerate(acc_ids):
+            user_ids = []
+            if users:
+                user_ids = (await db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), [
+                    {**user_body(n), "acc_id": acc_id} for n in range(users)
+                ])).all()
+            seeded.append({"email": f"bench-{run_id}-{i}@example.com", "user_ids": list(user_ids)})
+        await db.commit()
+    return seeded
+
+
+async def run(args) -> dict:
+    from main import app
+    from src.database.db import sessionmanager
+
+    run_id = uuid.uuid4().hex[:6]
+    seeded = await seed(run_id, args.accounts, args.users, args.database_url.startswith("sqlite"))
+    rnd = random.Random(args.seed)
+    results = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login(email: str) -> dict:
+            response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+            response.raise_for_status()
+            return response.json()
+
+        headers = []
+        for acc in seeded:
+            headers.append({"Authorization": f"Bearer {(await login(acc['email']))['access_token']}"})
+        refresh_tokens = [(await login(seeded[w % len(seeded)]["email"]))["refresh_token"]
+                          for w in range(args.concurrency)]
+        created: list[tuple[int, int]] = []
+
+        async def signup(i, w):
+            return await client.post("/auth/signup", json={
+                "username": f"s{run_id}{i}", "email": f"signup-{run_id}-{i}@example.com", "password": PASSWORD,
+            })
+
+        async def login_op(i, w):
+            return await client.post("/auth/login", data={"username": rnd.choice(seeded)["email"],
+                                                          "password": PASSWORD})
+
+        async def refresh(i, w):
+            response = await client.get("/auth/refresh_token",
+                                        headers={"Authorization": f"Bearer {refresh_tokens[w]}"})
+            if response.status_code == 200:
+                refresh_tokens[w] = response.json()["refresh_token"]
+            return response
+
+        def random_user() -> tuple[int, int]:
+            n = rnd.randrange(len(seeded))
+            return n, rnd.choice(seeded[n]["user_ids"])
+
+        async def list_op(i, w):
+            return await client.get("/api/users/", params={"limit": 20}, headers=rnd.choice(headers))
+
+        async def get(i, w):
+            n, user_id = random_user()
+            return await client.get(f"/api/users/{user_id}", headers=headers[n])
+
+        async def create(i, w):
+            n = rnd.randrange(len(seeded))
+            response = await client.post("/api/users/", json=user_body(i), headers=headers[n])
+            if response.status_code == 201:
+                created.append((n, response.json()["id"]))
+            return response
+
+        async def update(i, w):
+            n, user_id = random_user()
+            return await client.put(f"/api/users/{user_id}", json={**user_body(i), "data": True},
+                                    headers=headers[n])
+
+        async def delete(i, w):
+            n, user_id = created.pop()
+            return await client.delete(f"/api/users/{user_id}", headers=headers[n])
+
+        operations = {"signup": signup, "login": login_op, "refresh": refresh, "list": list_op, "get": get,
+                      "create": create, "update": update, "delete": delete}
+        for name in args.operations:
+            if name in ("get", "update") and not args.users:
+                continue
+            requests = min(args.requests, len(created)) if name == "delete" else args.requests
+            results[name] = await measure(operations[name], requests, args.concurrency)
+
+    await sessionmanager.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="SQLAlchemy URL; a temporary SQLite file by default")
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--users", type=int, default=100, help="users per account")
+    parser.add_argument("--requests", type=int, default=200, help="requests per operation")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--seed", type=int, default=0, help="random seed for picking accounts and users")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+    if args.database_url is None:
+        args.database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.sqlite"
+
+    # Налаштування читаються під час імпорту застосунку, тому змінні оточення задаються до нього.
+    os.environ["SQLALCHEMY_DATABASE_URL"] = args.database_url
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("REDIS_ENABLED", "false")
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "database_url")},
+        "database": args.database_url.split("://", 1)[0],
+        "results": asyncio.run(run(args)),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Бенчмарк рендерингу листів підтвердження.
+
+Порівнює рендеринг через середовище Jinja fastapi-mail, яке створюється для кожного листа,
+з попередньо скомпільованим :class:`TemplateRenderer`.
+Запуск: ``python -m benchmarks.email_rendering --messages 10000``.
+"""
+import argparse
+import json
+import time
+
+from src.services.email import conf, confirmation_renderer, CONFIRMATION_TEMPLATE
+
+
+def fastapi_mail_render(i: int) -> str:
+    template = conf.template_engine().get_template(CONFIRMATION_TEMPLATE)
+    return template.render(host="http://localhost:8000/", username=f"user{i}", token=f"token{i}")
+
+
+def cached_render(i: int) -> str:
+    return confirmation_renderer.render(host="http://localhost:8000/", username=f"user{i}", token=f"token{i}")
+
+
+def measure(render, messages: int) -> dict:
+    started = time.perf_counter()
+    for i in range(messages):
+        render(i)
+    elapsed = time.perf_counter() - started
+    return {"messages": messages, "elapsed_s": round(elapsed, 4), "per_message_us": round(elapsed / messages * 1e6, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+    assert fastapi_mail_render(1) == cached_render(1)
+    results = {
+        "fastapi_mail": measure(fastapi_mail_render, args.messages),
+        "cached": measure(cached_render, args.messages),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
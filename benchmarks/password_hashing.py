@@ -0,0 +1,66 @@
+"""
+Бенчмарк затримки циклу подій під час одночасних логінів.
+
+Порівнює синхронну перевірку bcrypt у корутині з перевіркою через пул виконавців.
+Запуск: ``python -m benchmarks.password_hashing --logins 32``.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from src.services.auth import auth_service
+
+
+async def probe_lag(stop: asyncio.Event, interval: float, samples: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+async def login_sync(password: str, hashed: str):
+    auth_service.verify_password(password, hashed)
+
+
+async def login_async(password: str, hashed: str):
+    await auth_service.verify_password_async(password, hashed)
+
+
+async def run(login, logins: int, hashed: str, interval: float) -> dict:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop, interval, samples))
+    await asyncio.sleep(interval * 2)
+    started = time.perf_counter()
+    await asyncio.gather(*(login("password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    samples.sort()
+    return {
+        "logins": logins,
+        "elapsed_s": round(elapsed, 3),
+        "lag_p50_ms": round(statistics.median(samples) * 1000, 2),
+        "lag_p99_ms": round(samples[int(len(samples) * 0.99) - 1] * 1000, 2),
+        "lag_max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--interval", type=float, default=0.005, help="lag probe interval, seconds")
+    args = parser.parse_args()
+
+    hashed = auth_service.get_password_hash("password")
+    results = {
+        "sync": asyncio.run(run(login_sync, args.logins, hashed, args.interval)),
+        "pool": asyncio.run(run(login_async, args.logins, hashed, args.interval)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Бенчмарк серіалізації сторінки користувачів.
+
+Порівнює шлях FastAPI з ``response_model=List[UserResponse]`` (перевірка ORM-об'єктів через pydantic,
+словники, ``json.dumps``), ``TypeAdapter.dump_json`` та серіалізацію рядків бази через orjson
+(:func:`src.services.serialization.users_json`). Окремо вимірюється завантаження сторінки разом із серіалізацією.
+Запуск: ``python -m benchmarks.serialization --rows 500 --repeat 200``.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
+from src.database.models import Account, User
+from src.repository import users as repository_users
+from src.schemas import UserResponse
+from src.services.serialization import users_json
+
+adapter = TypeAdapter(List[UserResponse])
+
+
+def response_model(users) -> bytes:
+    # Те саме, що робить FastAPI: перевірка, словники в JSON-режимі, потім json.dumps у JSONResponse.
+    content = adapter.dump_python(adapter.validate_python(users, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def type_adapter(users) -> bytes:
+    return adapter.dump_json(adapter.validate_python(users, from_attributes=True))
+
+
+def measure(func, arg, repeat: int) -> dict:
+    func(arg)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    per_page = (time.perf_counter() - started) / repeat
+    return {"per_page_ms": round(per_page * 1000, 3)}
+
+
+async def measure_async(load, serialize, repeat: int) -> dict:
+    serialize(await load())
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serialize(await load())
+    per_page = (time.perf_counter() - started) / repeat
+    return {"per_page_ms": round(per_page * 1000, 3)}
+
+
+async def run(rows: int, repeat: int) -> dict:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Account), [{"id": 1, "username": "bench", "email": "bench@ex.com", "password": "x",
+                                              "avatar": "https://www.gravatar.com/avatar/bench"}])
+        await conn.execute(insert(User), [
+            {"first_name": "Taras", "last_name": f"Shevchenko{n}", "email": f"taras{n}@ex.com",
+             "phone_number": f"38050{n:05d}", "birthday": "09.03.1814", "data": n % 2 == 0,
+             "created_at": datetime(2023, 8, 1, 10, 0, 0, n), "updated_at": datetime(2023, 8, 2, 11, 0, 0, n),
+             "acc_id": 1}
+            for n in range(rows)
+        ])
+    session = async_sessionmaker(bind=engine, expire_on_commit=False)()
+
+    async def load_users():
+        session.expunge_all()
+        return await repository_users.get_all_users(rows, 0, session)
+
+    async def load_rows():
+        return await repository_users.get_user_rows(rows, 0, session)
+
+    users = await load_users()
+    user_rows = await load_rows()
+    assert json.loads(response_model(users)) == json.loads(users_json(user_rows))
+    results = {
+        "rows": rows,
+        "serialize": {
+            "response_model": measure(response_model, users, repeat),
+            "type_adapter_dump_json": measure(type_adapter, users, repeat),
+            "orjson_rows": measure(users_json, user_rows, repeat),
+        },
+        "load_and_serialize": {
+            "orm_response_model": await measure_async(load_users, response_model, repeat),
+            "rows_orjson": await measure_async(load_rows, users_json, repeat),
+        },
+    }
+    await session.close()
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.rows, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,16 @@ import asyncio
 
 import uvicorn
 from fastapi import FastAPI, BackgroundTasks
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware
 
-from src.routes import users, auth
+from src.conf.config import config
+from src.database.db import WriteMarkerMiddleware, sessionmanager
+from src.routes import users, auth, accounts, jwks, metrics
+from src.services.avatars import AvatarStaticFiles
+from src.services.instrumentation import MetricsMiddleware, instrument_engine
+from src.services.lifespan import InFlightMiddleware, lifespan
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,11 +19,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Last-Write"],
 )
-
-app.mount("/static", StaticFiles(directory="src/static"), name="static")
+if config.sqlalchemy_replica_urls:
+    app.add_middleware(WriteMarkerMiddleware)
+if config.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(sessionmanager.engine)
+# Останнім доданий проміжний шар — зовнішній, тож він рахує запит повністю.
+app.add_middleware(InFlightMiddleware)
+
+app.mount("/static", AvatarStaticFiles(directory=config.static_dir), name="static")
 app.include_router(auth.router)
 app.include_router(users.router, prefix='/api')
+app.include_router(accounts.router, prefix='/api')
+app.include_router(jwks.router)
+app.include_router(metrics.router)
 
 
 async def task():
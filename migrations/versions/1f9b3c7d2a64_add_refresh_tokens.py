@@ -0,0 +1,35 @@
+"""add refresh tokens
+
+Revision ID: 1f9b3c7d2a64
+Revises: e81f4a6b0c27
+Create Date: 2026-10-17 15:03:22.480116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f9b3c7d2a64'
+down_revision: Union[str, None] = 'e81f4a6b0c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('refresh_tokens',
+                    sa.Column('jti', sa.String(length=32), nullable=False),
+                    sa.Column('acc_id', sa.Integer(), nullable=False),
+                    sa.Column('expires_at', sa.DateTime(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=False),
+                    sa.ForeignKeyConstraint(['acc_id'], ['acc.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('jti')
+                    )
+    op.create_index(op.f('ix_refresh_tokens_acc_id'), 'refresh_tokens', ['acc_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_refresh_tokens_acc_id'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
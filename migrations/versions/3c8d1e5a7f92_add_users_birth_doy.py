@@ -0,0 +1,61 @@
+"""add users birth_date and birth_doy
+
+Revision ID: 3c8d1e5a7f92
+Revises: 9a4e6f2b8d15
+Create Date: 2026-10-17 17:20:48.102655
+
+"""
+import contextlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.services.birthdays import birthday_fields
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8d1e5a7f92'
+down_revision: Union[str, None] = '9a4e6f2b8d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+users = sa.table('users', sa.column('id', sa.Integer), sa.column('birthday', sa.String),
+                 sa.column('birth_date', sa.Date), sa.column('birth_doy', sa.SmallInteger))
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('birth_date', sa.Date(), nullable=True))
+    op.add_column('users', sa.Column('birth_doy', sa.SmallInteger(), nullable=True))
+    op.create_index('ix_users_acc_id_birth_doy', 'users', ['acc_id', 'birth_doy'], unique=False)
+
+    # Заповнюємо нові колонки пакетами за id. На PostgreSQL кожен пакет фіксується окремо, щоб не тримати
+    # блокування на всій таблиці під час розбору рядків; SQLite не підтримує autocommit-блоків Alembic.
+    update = (sa.update(users).where(users.c.id == sa.bindparam('_id'))
+              .values(birth_date=sa.bindparam('_birth_date'), birth_doy=sa.bindparam('_birth_doy')))
+    context = op.get_context()
+    with context.autocommit_block() if context.impl.transactional_ddl else contextlib.nullcontext():
+        conn = op.get_bind()
+        last_id = 0
+        while True:
+            rows = conn.execute(sa.select(users.c.id, users.c.birthday)
+                                .where(users.c.id > last_id).order_by(users.c.id).limit(BATCH_SIZE)).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                fields = birthday_fields(row.birthday)
+                if fields['birth_date'] is not None:
+                    params.append({'_id': row.id, '_birth_date': fields['birth_date'],
+                                   '_birth_doy': fields['birth_doy']})
+            if params:
+                conn.execute(update, params)
+            last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_acc_id_birth_doy', table_name='users')
+    op.drop_column('users', 'birth_doy')
+    op.drop_column('users', 'birth_date')
@@ -0,0 +1,38 @@
+"""add users search index
+
+Revision ID: 9a4e6f2b8d15
+Revises: 1f9b3c7d2a64
+Create Date: 2026-10-17 16:05:21.537190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e6f2b8d15'
+down_revision: Union[str, None] = '1f9b3c7d2a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Вираз має збігатися з repository.users.search_document(), інакше планувальник не використає індекс.
+SEARCH_DOCUMENT = "lower(first_name || ' ' || last_name || ' ' || email || ' ' || phone_number)"
+
+
+def upgrade() -> None:
+    # Триграмний індекс є лише в PostgreSQL; на SQLite пошук виконується через LIKE без індексу.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_search_trgm ON users '
+                   f'USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_users_search_trgm')
@@ -0,0 +1,28 @@
+"""add users acc_id indexes
+
+Revision ID: c5d2e7a91f03
+Revises: 504a98ed1f36
+Create Date: 2026-10-17 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e7a91f03'
+down_revision: Union[str, None] = '504a98ed1f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_acc_id_id', 'users', ['acc_id', 'id'], unique=False)
+    op.create_index('ix_users_acc_id_created_at', 'users', ['acc_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_acc_id_created_at', table_name='users')
+    op.drop_index('ix_users_acc_id_id', table_name='users')
@@ -0,0 +1,42 @@
+"""add email outbox
+
+Revision ID: e81f4a6b0c27
+Revises: c5d2e7a91f03
+Create Date: 2026-10-17 12:41:05.917342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f4a6b0c27'
+down_revision: Union[str, None] = 'c5d2e7a91f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('email_outbox',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('recipient', sa.String(length=250), nullable=False),
+                    sa.Column('username', sa.String(length=50), nullable=False),
+                    sa.Column('host', sa.String(length=255), nullable=False),
+                    sa.Column('status', sa.Enum('pending', 'sent', 'failed', name='emailstatus'), nullable=False),
+                    sa.Column('attempts', sa.Integer(), nullable=False),
+                    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+                    sa.Column('last_error', sa.String(length=500), nullable=True),
+                    sa.Column('created_at', sa.DateTime(), nullable=False),
+                    sa.Column('sent_at', sa.DateTime(), nullable=True),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_email_outbox_status_next_attempt_at', 'email_outbox', ['status', 'next_attempt_at'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    op.execute("DROP TYPE IF EXISTS emailstatus")
@@ -5,3 +5,12 @@ EMAIL_NOT_CONFIRMED = "Email not confirmed"
 INVALID_PASS = "Invalid password"
 INVALID_REFRESH_TOKEN = "Invalid refresh token"
 VERIFICATION_ERR = "Verification error"
+SERVICE_BUSY = "Service is busy, retry later"
+INVALID_CURSOR = "Invalid cursor"
+INVALID_BULK_BODY = "Expected a JSON array or an NDJSON stream of users"
+TOO_MANY_REQUESTS = "Too many requests"
+INVALID_FIELDS = "Unknown fields requested"
+PRECONDITION_FAILED = "User was modified since the given ETag"
+AVATARS_UNAVAILABLE = "Avatar uploads are not available on this server"
+AVATAR_TOO_LARGE = "Avatar file is too large"
+INVALID_AVATAR = "Avatar must be a PNG, JPEG, GIF or WebP image"
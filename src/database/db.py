@@ -6,18 +6,35 @@
 
 Classes:
     Base: Базовий клас для оголошення моделей SQLAlchemy.
+    InstrumentedQueuePool: Пул з'єднань з метриками очікування, тайм-аутів та переповнення.
     DatabaseSessionManager: Клас для керування сесіями бази даних SQLAlchemy.
+    ReplicaRouter: Почерговий вибір реплік для читання.
+    WriteMarkerMiddleware: Позначка останнього запису у відповідях на змінювальні запити.
 
 Functions:
     get_db: Залежність для отримання асинхронної сесії бази даних.
+    get_read_db: Залежність для отримання сесії для читання (репліка або основна база).
 """
 import contextlib
+import itertools
+import logging
+import time
 from typing import AsyncIterator
 
+from fastapi import Depends, Request
+from sqlalchemy import exc, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.conf.config import config
+from src.services.metrics import (DB_POOL_CHECKOUT_SECONDS, DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_OVERFLOW_CHECKOUTS,
+                                  DB_POOL_CONNECTIONS)
+
+logger = logging.getLogger(__name__)
+
+WRITE_MARKER_HEADER = "X-Last-Write"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
 
 class Base(DeclarativeBase):
@@ -26,20 +43,101 @@ class Base(DeclarativeBase):
     """
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул з'єднань, що вимірює час очікування з'єднання, тайм-аути та видачі понад ``pool_size``.
+
+    :cvar name: Назва пулу в мітках метрик.
+    """
+    name: str = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(self.name).inc()
+            raise
+        DB_POOL_CHECKOUT_SECONDS.labels(self.name).observe(time.perf_counter() - started)
+        if self.overflow() > 0:
+            DB_POOL_OVERFLOW_CHECKOUTS.labels(self.name).inc()
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.name = self.name
+        return pool
+
+
+def engine_options(url: str) -> dict:
+    """
+    Параметри пулу з'єднань з налаштувань.
+
+    SQLite використовує власні пули SQLAlchemy, тому для нього параметри пулу не передаються.
+
+    :param url: URL бази даних для підключення.
+    :return: Іменовані аргументи для ``create_async_engine``.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return dict(poolclass=InstrumentedQueuePool, pool_size=config.db_pool_size, max_overflow=config.db_max_overflow,
+                pool_timeout=config.db_pool_timeout, pool_recycle=config.db_pool_recycle,
+                pool_pre_ping=config.db_pool_pre_ping)
+
+
 class DatabaseSessionManager:
     """
     Клас для керування сесіями бази даних SQLAlchemy.
     """
-    def __init__(self, url: str):
+    def __init__(self, url: str, name: str = "primary"):
         """
         Ініціалізує об'єкт DatabaseSessionManager.
 
         :param url: URL бази даних для підключення.
+        :param name: Назва бази даних у мітках метрик пулу.
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
+        self.name = name
+        self._engine: AsyncEngine | None = create_async_engine(url, **engine_options(url))
         self._session_maker: async_sessionmaker | None = async_sessionmaker(autocommit=False, autoflush=False,
                                                                             expire_on_commit=False,
                                                                             bind=self._engine)
+        pool = self._engine.sync_engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.name = name
+            for state in ("size", "checked_in", "checked_out", "overflow"):
+                DB_POOL_CONNECTIONS.labels(name, state).set_function(
+                    lambda state=state: self.pool_status().get(state, 0))
+
+    @property
+    def engine(self) -> AsyncEngine | None:
+        """
+        Асинхронний рушій SQLAlchemy або None, якщо менеджер закрито.
+        """
+        return self._engine
+
+    def pool_status(self) -> dict:
+        """
+        Поточний стан пулу з'єднань.
+
+        :return: Кількість з'єднань за станами або порожній словник, якщо пул не має черги.
+        """
+        if self._engine is None:
+            return {}
+        pool = self._engine.sync_engine.pool
+        if not isinstance(pool, AsyncAdaptedQueuePool):
+            return {}
+        return {"size": pool.size(), "checked_in": pool.checkedin(), "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0)}
+
+    async def close(self):
+        """
+        Закрити всі з'єднання пулу. Після виклику менеджер більше не видає сесій.
+        """
+        if self._engine is None:
+            return
+        await self._engine.dispose()
+        self._engine = None
+        self._session_maker = None
 
     @contextlib.asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
@@ -60,7 +158,114 @@ class DatabaseSessionManager:
             await session.close()
 
 
+class ReplicaRouter:
+    """
+    Почерговий (round-robin) вибір репліки для читання.
+
+    Репліка, до якої не вдалося підключитися, пропускається на ``retry_interval`` секунд.
+    """
+    def __init__(self, urls: list[str], retry_interval: float):
+        """
+        :param urls: URL реплік бази даних.
+        :param retry_interval: Скільки секунд не звертатися до недоступної репліки.
+        """
+        self.replicas = [DatabaseSessionManager(url, name=f"replica{i}") for i, url in enumerate(urls)]
+        self.retry_interval = retry_interval
+        self._counter = itertools.count()
+        self._down_until = [0.0] * len(self.replicas)
+
+    def _candidates(self) -> list[int]:
+        start = next(self._counter) % len(self.replicas)
+        now = time.monotonic()
+        order = [(start + i) % len(self.replicas) for i in range(len(self.replicas))]
+        return [i for i in order if self._down_until[i] <= now]
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession | None]:
+        """
+        Сесія наступної доступної репліки з уже отриманим з'єднанням.
+
+        :return: Асинхронна сесія репліки або None, якщо реплік немає чи жодна не відповідає.
+        """
+        session = None
+        for i in self._candidates() if self.replicas else []:
+            manager = self.replicas[i]
+            if manager._session_maker is None:
+                continue
+            session = manager._session_maker()
+            try:
+                await session.connection()
+                break
+            except (exc.DBAPIError, exc.TimeoutError, OSError) as err:
+                logger.warning("Replica %s is unavailable: %s", manager.name, err)
+                self._down_until[i] = time.monotonic() + self.retry_interval
+                await session.close()
+                session = None
+        try:
+            yield session
+        finally:
+            if session is not None:
+                await session.close()
+
+    def owns(self, session: AsyncSession) -> bool:
+        """
+        Чи підключена сесія до однієї з реплік.
+        """
+        return any(session.bind is manager.engine for manager in self.replicas)
+
+    async def close(self):
+        """
+        Закрити пули з'єднань усіх реплік.
+        """
+        for manager in self.replicas:
+            await manager.close()
+
+
+def recent_write(marker: str | None, window: float) -> bool:
+    """
+    Чи був запис клієнта недавно, тобто чи може репліка ще не мати його змін.
+
+    :param marker: Значення заголовка ``X-Last-Write`` з попередньої відповіді (секунди Unix-часу).
+    :param window: Допустиме відставання реплік у секундах.
+    :return: True, якщо читати потрібно з основної бази.
+    """
+    if not marker:
+        return False
+    try:
+        written_at = float(marker)
+    except ValueError:
+        return False
+    return time.time() - written_at < window
+
+
+class WriteMarkerMiddleware:
+    """
+    ASGI-проміжний шар, що додає заголовок ``X-Last-Write`` до успішних відповідей на змінювальні запити.
+
+    Клієнт повертає цей заголовок у наступних запитах, і протягом ``replica_lag_window`` секунд
+    :func:`get_read_db` читає з основної бази, тож клієнт бачить власні зміни. Змінювальні GET-запити
+    (підтвердження email за посиланням з листа) маркер не отримують.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"],
+                                      (WRITE_MARKER_HEADER.lower().encode(), f"{time.time():.3f}".encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
 sessionmanager = DatabaseSessionManager(config.sqlalchemy_database_url)
+replica_router = ReplicaRouter(config.sqlalchemy_replica_urls, config.replica_retry_interval)
 
 
 # Dependency
@@ -72,3 +277,23 @@ async def get_db():
     """
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Залежність для отримання сесії для читання.
+
+    Повертає сесію репліки, вибраної по черзі. Якщо реплік немає, жодна не відповідає або запит містить
+    свіжий заголовок ``X-Last-Write``, повертає сесію основної бази з :func:`get_db`. Ця сесія
+    отримує з'єднання лише під час першого запиту, тож при читанні з репліки основний пул не використовується.
+
+    :param request: Поточний запит.
+    :param db: Сесія основної бази даних.
+    :return: Асинхронна сесія бази даних.
+    """
+    if not replica_router.replicas or recent_write(request.headers.get(WRITE_MARKER_HEADER),
+                                                   config.replica_lag_window):
+        yield db
+        return
+    async with replica_router.session() as session:
+        yield session if session is not None else db
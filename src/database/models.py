@@ -8,12 +8,15 @@ Classes:
     User: Модель користувача для зберігання інформації про користувачів.
     Role: Перерахування, що визначає можливі ролі облікового запису користувача.
     Account: Модель облікового запису для зберігання інформації про облікові записи користувачів.
+    EmailStatus: Перерахування, що визначає стан листа в черзі відправлення.
+    EmailOutbox: Модель черги листів для відправлення окремим обробником.
+    RefreshToken: Модель виданих токенів оновлення.
 """
 
 import enum
 from datetime import date
 
-from sqlalchemy import String, Integer, DateTime, func, ForeignKey, Enum, Boolean
+from sqlalchemy import String, Integer, SmallInteger, Date, DateTime, func, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.db import Base
@@ -30,19 +33,29 @@ class User(Base):
     :cvar email: Email користувача.
     :cvar phone_number: Номер телефону користувача.
     :cvar birthday: День народження користувача.
+    :cvar birth_date: Розібрана дата народження або None, якщо ``birthday`` не вдалося розібрати.
+    :cvar birth_doy: День року дати народження за високосним роком (1–366).
     :cvar data: Додаткові дані користувача.
     :cvar created_at: Дата створення запису про користувача.
     :cvar updated_at: Дата оновлення запису про користувача.
     :cvar acc_id: Ідентифікатор облікового запису користувача.
     :cvar acc: Зв'язок з моделлю облікового запису.
+    :cvar __table_args__: Складені індекси для вибірок користувачів певного облікового запису.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_acc_id_id", "acc_id", "id"),
+        Index("ix_users_acc_id_created_at", "acc_id", "created_at"),
+        Index("ix_users_acc_id_birth_doy", "acc_id", "birth_doy"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[str] = mapped_column(String(150))
     last_name: Mapped[str] = mapped_column(String(150), index=True)
     email: Mapped[str] = mapped_column(String(150))
     phone_number: Mapped[str] = mapped_column(String(30))
     birthday: Mapped[str] = mapped_column(String(30))
+    birth_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    birth_doy: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
     data: Mapped[bool] = mapped_column(default=False, nullable=True)
     created_at: Mapped[date] = mapped_column('created_at', DateTime, default=func.now(), nullable=True)
     updated_at: Mapped[date] = mapped_column('updated_at', DateTime, default=func.now(), onupdate=func.now(),
@@ -91,3 +104,65 @@ class Account(Base):
     refresh_token: Mapped[str] = mapped_column(String(255), nullable=True)
     role: Mapped[Enum] = mapped_column('role', Enum(Role), default=Role.user)
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
+class EmailStatus(enum.Enum):
+    """
+    Перерахування, що визначає стан листа в черзі відправлення.
+
+    :cvar pending: Лист очікує на відправлення або повторну спробу.
+    :cvar sent: Лист відправлено.
+    :cvar failed: Лист не відправлено після всіх спроб.
+    """
+    pending: str = "pending"
+    sent: str = "sent"
+    failed: str = "failed"
+
+
+class EmailOutbox(Base):
+    """
+    Модель черги листів для відправлення окремим обробником.
+
+    :cvar __tablename__: Назва таблиці в базі даних.
+    :cvar id: Унікальний ідентифікатор листа.
+    :cvar recipient: Email отримувача.
+    :cvar username: Ім'я користувача для шаблону листа.
+    :cvar host: Базова URL-адреса застосунку для посилання підтвердження.
+    :cvar status: Стан листа.
+    :cvar attempts: Кількість виконаних спроб відправлення.
+    :cvar next_attempt_at: Час, не раніше якого буде виконано наступну спробу.
+    :cvar last_error: Текст останньої помилки відправлення.
+    :cvar created_at: Дата додавання листа до черги.
+    :cvar sent_at: Дата відправлення листа.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    recipient: Mapped[str] = mapped_column(String(250), nullable=False)
+    username: Mapped[str] = mapped_column(String(50))
+    host: Mapped[str] = mapped_column(String(255))
+    status: Mapped[Enum] = mapped_column('status', Enum(EmailStatus), default=EmailStatus.pending, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[date] = mapped_column(DateTime, default=func.now(), nullable=False)
+    last_error: Mapped[str] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[date] = mapped_column('created_at', DateTime, default=func.now())
+    sent_at: Mapped[date] = mapped_column(DateTime, nullable=True)
+
+
+class RefreshToken(Base):
+    """
+    Модель виданих токенів оновлення. Кожен пристрій облікового запису має власний запис.
+
+    :cvar __tablename__: Назва таблиці в базі даних.
+    :cvar jti: Ідентифікатор токена (claim ``jti``).
+    :cvar acc_id: Ідентифікатор облікового запису.
+    :cvar expires_at: Час, після якого токен недійсний.
+    :cvar created_at: Дата видачі токена.
+    """
+    __tablename__ = "refresh_tokens"
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    acc_id: Mapped[int] = mapped_column(Integer, ForeignKey("acc.id", ondelete="CASCADE"), index=True)
+    expires_at: Mapped[date] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[date] = mapped_column('created_at', DateTime, default=func.now())
@@ -9,12 +9,13 @@
 """
 import logging
 
-from libgravatar import Gravatar
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import Account
+from src.database.models import Account, Role
 from src.schemas import AccountSchema
+from src.services.avatars import gravatar_url
+from src.services.cache import account_cache, user_list_cache
 
 
 async def get_acc_by_email(email: str, db: AsyncSession) -> Account:
@@ -40,13 +41,7 @@ async def create_acc(body: AccountSchema, db: AsyncSession) -> Account:
     :param db: Асинхронна сесія бази даних.
     :return: Об'єкт нового облікового запису.
     """
-    avatar = None
-    try:
-        g = Gravatar(body.email)
-        avatar = g.get_image()
-    except Exception as e:
-        logging.error(e)
-    new_acc = Account(**body.model_dump(), avatar=avatar)
+    new_acc = Account(**body.model_dump(), avatar=gravatar_url(body.email))
     db.add(new_acc)
     await db.commit()
     await db.refresh(new_acc)
@@ -63,6 +58,7 @@ async def update_token(user: Account, token: str | None, db: AsyncSession) -> No
     """
     user.refresh_token = token
     await db.commit()
+    await account_cache.invalidate(user.email)
 
 
 async def confirmed_email(email: str, db: AsyncSession) -> None:
@@ -74,4 +70,41 @@ async def confirmed_email(email: str, db: AsyncSession) -> None:
     """
     user = await get_acc_by_email(email, db)
     user.confirmed = True
-    await db.commit()
\ No newline at end of file
+    await db.commit()
+    await account_cache.invalidate(email)
+
+
+async def update_role(email: str, role: Role, db: AsyncSession) -> Account | None:
+    """
+    Змінити роль облікового запису.
+
+    :param email: Email для пошуку облікового запису.
+    :param role: Нова роль облікового запису.
+    :param db: Асинхронна сесія бази даних.
+    :return: Оновлений обліковий запис або None, якщо обліковий запис не знайдено.
+    """
+    user = await get_acc_by_email(email, db)
+    if user:
+        user.role = role
+        await db.commit()
+        await account_cache.invalidate(email)
+    return user
+
+
+async def update_avatar(email: str, url: str, db: AsyncSession) -> Account | None:
+    """
+    Змінити аватар облікового запису.
+
+    :param email: Email для пошуку облікового запису.
+    :param url: URL нового аватара.
+    :param db: Асинхронна сесія бази даних.
+    :return: Оновлений обліковий запис або None, якщо обліковий запис не знайдено.
+    """
+    user = await get_acc_by_email(email, db)
+    if user:
+        user.avatar = url
+        await db.commit()
+        await account_cache.invalidate(email)
+        # Сторінки користувачів містять вкладений обліковий запис з аватаром.
+        await user_list_cache.invalidate(user.id)
+    return user
@@ -0,0 +1,87 @@
+"""
+Модуль, який надає функціональність для роботи з чергою листів у базі даних.
+
+Цей модуль визначає функції для додавання листів до черги, вибору пакета листів для відправлення
+та фіксації результату відправлення з повторними спробами.
+
+.. moduleauthor:: Nevskiy911
+
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import EmailOutbox, EmailStatus
+
+
+def enqueue_confirmation(email: str, username: str, host: str, db: AsyncSession) -> EmailOutbox:
+    """
+    Додати лист підтвердження email до черги.
+
+    Лист лише додається до сесії і зберігається разом з найближчим commit, тож він записується
+    в тій самій транзакції, що й обліковий запис.
+
+    :param email: Email отримувача.
+    :param username: Ім'я користувача для шаблону листа.
+    :param host: Базова URL-адреса застосунку.
+    :param db: Асинхронна сесія бази даних.
+    :return: Об'єкт листа в черзі.
+    """
+    message = EmailOutbox(recipient=email, username=username, host=host, status=EmailStatus.pending, attempts=0,
+                          next_attempt_at=datetime.utcnow())
+    db.add(message)
+    return message
+
+
+async def claim_batch(limit: int, db: AsyncSession) -> list[EmailOutbox]:
+    """
+    Вибрати пакет листів, готових до відправлення.
+
+    На PostgreSQL рядки блокуються з ``SKIP LOCKED`` до кінця транзакції, тож кілька обробників
+    не відправляють той самий лист.
+
+    :param limit: Максимальна кількість листів у пакеті.
+    :param db: Асинхронна сесія бази даних.
+    :return: Список листів.
+    """
+    sq = (select(EmailOutbox)
+          .where(EmailOutbox.status == EmailStatus.pending, EmailOutbox.next_attempt_at <= datetime.utcnow())
+          .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+          .limit(limit)
+          .with_for_update(skip_locked=True))
+    result = await db.execute(sq)
+    return list(result.scalars().all())
+
+
+def mark_sent(message: EmailOutbox) -> None:
+    """
+    Позначити лист як відправлений. Зміни зберігаються з найближчим commit.
+
+    :param message: Лист з черги.
+    """
+    message.attempts += 1
+    message.status = EmailStatus.sent
+    message.sent_at = datetime.utcnow()
+    message.last_error = None
+
+
+def mark_failed(message: EmailOutbox, error: str, max_attempts: int, base_delay: float, max_delay: float) -> None:
+    """
+    Зафіксувати невдалу спробу відправлення та запланувати наступну з експоненційною затримкою.
+
+    Після ``max_attempts`` спроб лист позначається як невідправлений. Зміни зберігаються з найближчим commit.
+
+    :param message: Лист з черги.
+    :param error: Текст помилки.
+    :param max_attempts: Максимальна кількість спроб.
+    :param base_delay: Затримка перед другою спробою, секунди.
+    :param max_delay: Максимальна затримка між спробами, секунди.
+    """
+    message.attempts += 1
+    message.last_error = error[:500]
+    if message.attempts >= max_attempts:
+        message.status = EmailStatus.failed
+        return
+    delay = min(base_delay * 2 ** (message.attempts - 1), max_delay)
+    message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
@@ -0,0 +1,77 @@
+"""
+Модуль, який надає функціональність для роботи з токенами оновлення в базі даних.
+
+Токени оновлення зберігаються у вузькій таблиці ``refresh_tokens`` за ідентифікатором ``jti``,
+тож вхід і оновлення токенів не переписують рядок облікового запису, а один обліковий запис
+може мати кілька активних сесій.
+
+.. moduleauthor:: Nevskiy911
+
+"""
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import RefreshToken
+
+
+async def add_refresh_token(jti: str, acc_id: int, expires_at: datetime, db: AsyncSession) -> None:
+    """
+    Зберегти новий токен оновлення та видалити прострочені токени облікового запису.
+
+    :param jti: Ідентифікатор токена.
+    :param acc_id: Ідентифікатор облікового запису.
+    :param expires_at: Час, після якого токен недійсний.
+    :param db: Асинхронна сесія бази даних.
+    """
+    await db.execute(delete(RefreshToken).where(RefreshToken.acc_id == acc_id,
+                                                RefreshToken.expires_at <= datetime.utcnow()))
+    db.add(RefreshToken(jti=jti, acc_id=acc_id, expires_at=expires_at))
+    await db.commit()
+
+
+async def rotate_refresh_token(old_jti: str, new_jti: str, acc_id: int, expires_at: datetime,
+                               db: AsyncSession) -> bool:
+    """
+    Замінити використаний токен оновлення новим в одній транзакції.
+
+    :param old_jti: Ідентифікатор використаного токена.
+    :param new_jti: Ідентифікатор нового токена.
+    :param acc_id: Ідентифікатор облікового запису.
+    :param expires_at: Час, після якого новий токен недійсний.
+    :param db: Асинхронна сесія бази даних.
+    :return: False, якщо старий токен уже було використано або відкликано.
+    """
+    result = await db.execute(delete(RefreshToken).where(RefreshToken.jti == old_jti,
+                                                         RefreshToken.acc_id == acc_id))
+    if result.rowcount != 1:
+        await db.rollback()
+        return False
+    db.add(RefreshToken(jti=new_jti, acc_id=acc_id, expires_at=expires_at))
+    await db.commit()
+    return True
+
+
+async def revoke_refresh_token(jti: str, db: AsyncSession) -> None:
+    """
+    Відкликати один токен оновлення.
+
+    :param jti: Ідентифікатор токена.
+    :param db: Асинхронна сесія бази даних.
+    """
+    await db.execute(delete(RefreshToken).where(RefreshToken.jti == jti))
+    await db.commit()
+
+
+async def revoke_all_refresh_tokens(acc_id: int, db: AsyncSession) -> int:
+    """
+    Відкликати всі токени оновлення облікового запису.
+
+    :param acc_id: Ідентифікатор облікового запису.
+    :param db: Асинхронна сесія бази даних.
+    :return: Кількість відкликаних токенів.
+    """
+    result = await db.execute(delete(RefreshToken).where(RefreshToken.acc_id == acc_id))
+    await db.commit()
+    return result.rowcount
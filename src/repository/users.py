@@ -8,14 +8,68 @@
 
 """
 
-from sqlalchemy import select
+from datetime import date
+from typing import AsyncIterator
+
+from sqlalchemy import select, insert, update, delete, Row, case, func, literal_column, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, noload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.database.models import User, Account
 from src.schemas import UserSchema, UserUpdateSchema
+from src.services.birthdays import DAYS_IN_YEAR, birthday_fields, birthday_window, day_of_year
+from src.services.cache import user_list_cache
+
+EXPORT_COLUMNS = (User.id, User.first_name, User.last_name, User.email, User.phone_number, User.birthday, User.data,
+                  User.created_at, User.updated_at, User.acc_id)
+ROW_COLUMNS = EXPORT_COLUMNS + (Account.username.label("acc_username"), Account.email.label("acc_email"),
+                                Account.avatar.label("acc_avatar"), Account.updated_at.label("acc_updated_at"))
+
+
+def _paginate(sq, limit: int, offset: int, after_id: int | None):
+    """
+    Додати до запиту сортування за ідентифікатором та сторінку за зсувом або за курсором.
+
+    :param sq: Запит на вибірку користувачів.
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених користувачів, якщо курсор не задано.
+    :type offset: int
+    :param after_id: Ідентифікатор останнього користувача попередньої сторінки або None.
+    :type after_id: int | None
+    :return: Запит зі сторінкою.
+    """
+    sq = sq.order_by(User.id)
+    if after_id is not None:
+        sq = sq.where(User.id > after_id)
+    else:
+        sq = sq.offset(offset)
+    return sq.limit(limit)
+
+
+def _select_users(columns: list[str] | None = None, include_acc: bool = True):
+    """
+    Створити запит на вибірку користувачів лише з потрібними колонками.
+
+    :param columns: Назви колонок користувача для завантаження або None для всіх колонок.
+    :type columns: list[str] | None
+    :param include_acc: Чи приєднувати обліковий запис користувача.
+    :type include_acc: bool
+    :return: Запит на вибірку користувачів.
+    """
+    sq = select(User)
+    if columns is not None:
+        # updated_at потрібен для ETag, навіть якщо клієнт його не запитував.
+        names = dict.fromkeys(["id", "updated_at", *columns])
+        sq = sq.options(load_only(*(getattr(User, name) for name in names)))
+    if not include_acc:
+        sq = sq.options(noload(User.acc))
+    return sq
 
 
-async def get_users(limit: int, offset: int, db: AsyncSession, acc: Account):
+async def get_users(limit: int, offset: int, db: AsyncSession, acc: Account, after_id: int | None = None,
+                    columns: list[str] | None = None, include_acc: bool = True):
     """
     Отримати список користувачів для певного облікового запису.
 
@@ -27,14 +81,21 @@ async def get_users(limit: int, offset: int, db: AsyncSession, acc: Account):
     :type db: AsyncSession
     :param acc: Обліковий запис, до якого належить список користувачів.
     :type acc: Account
+    :param after_id: Ідентифікатор останнього користувача попередньої сторінки (курсорна пагінація).
+    :type after_id: int | None
+    :param columns: Назви колонок користувача для завантаження або None для всіх колонок.
+    :type columns: list[str] | None
+    :param include_acc: Чи приєднувати обліковий запис користувача.
+    :type include_acc: bool
     :return: Список користувачів.
     """
-    sq = select(User).filter_by(acc=acc).offset(offset).limit(limit)
+    sq = _paginate(_select_users(columns, include_acc).where(User.acc_id == acc.id), limit, offset, after_id)
     users = await db.execute(sq)
     return users.scalars().all()
 
 
-async def get_all_users(limit: int, offset: int, db: AsyncSession):
+async def get_all_users(limit: int, offset: int, db: AsyncSession, after_id: int | None = None,
+                        columns: list[str] | None = None, include_acc: bool = True):
     """
     Отримати список всіх користувачів.
 
@@ -44,14 +105,218 @@ async def get_all_users(limit: int, offset: int, db: AsyncSession):
     :type offset: int
     :param db: Сесія бази даних.
     :type db: AsyncSession
+    :param after_id: Ідентифікатор останнього користувача попередньої сторінки (курсорна пагінація).
+    :type after_id: int | None
+    :param columns: Назви колонок користувача для завантаження або None для всіх колонок.
+    :type columns: list[str] | None
+    :param include_acc: Чи приєднувати обліковий запис користувача.
+    :type include_acc: bool
     :return: Список всіх користувачів.
     """
-    sq = select(User).offset(offset).limit(limit)
+    sq = _paginate(_select_users(columns, include_acc), limit, offset, after_id)
+    users = await db.execute(sq)
+    return users.scalars().all()
+
+
+async def get_user_rows(limit: int, offset: int, db: AsyncSession, acc: Account | None = None,
+                        after_id: int | None = None):
+    """
+    Отримати сторінку користувачів як рядки з колонками ``ROW_COLUMNS`` без створення ORM-об'єктів.
+
+    Використовується для швидкої серіалізації списків у JSON (:func:`src.services.serialization.users_json`).
+
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених користувачів під час генерації.
+    :type offset: int
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, користувачів якого потрібно вибрати, або None для всіх користувачів.
+    :type acc: Account | None
+    :param after_id: Ідентифікатор останнього користувача попередньої сторінки (курсорна пагінація).
+    :type after_id: int | None
+    :return: Рядки користувачів з колонками облікового запису.
+    """
+    sq = select(*ROW_COLUMNS).outerjoin(User.acc)
+    if acc is not None:
+        sq = sq.where(User.acc_id == acc.id)
+    result = await db.execute(_paginate(sq, limit, offset, after_id))
+    return result.all()
+
+
+async def get_user_versions(limit: int, offset: int, db: AsyncSession, acc: Account | None = None,
+                            after_id: int | None = None, include_acc: bool = True):
+    """
+    Отримати лише версії ``(id, updated_at[, acc_updated_at])`` користувачів сторінки для перевірки ETag.
+
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених користувачів під час генерації.
+    :type offset: int
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, користувачів якого потрібно вибрати, або None для всіх користувачів.
+    :type acc: Account | None
+    :param after_id: Ідентифікатор останнього користувача попередньої сторінки (курсорна пагінація).
+    :type after_id: int | None
+    :param include_acc: Чи додавати версію облікового запису користувача.
+    :type include_acc: bool
+    :return: Рядки з версіями користувачів сторінки.
+    """
+    sq = select(User.id, User.updated_at)
+    if include_acc:
+        sq = sq.add_columns(Account.updated_at.label("acc_updated_at")).outerjoin(User.acc)
+    if acc is not None:
+        sq = sq.where(User.acc_id == acc.id)
+    result = await db.execute(_paginate(sq, limit, offset, after_id))
+    return result.all()
+
+
+async def lock_user_version(user_id: int, db: AsyncSession, acc: Account):
+    """
+    Заблокувати рядок користувача до кінця транзакції та отримати час його останнього оновлення.
+
+    Використовується для перевірки If-Match перед оновленням чи видаленням.
+
+    :param user_id: Ідентифікатор користувача.
+    :type user_id: int
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, до якого належить ідентифікатор користувача.
+    :type acc: Account
+    :return: Кортеж ``(updated_at,)`` або None, якщо користувача не знайдено.
+    """
+    sq = select(User.updated_at).where(User.id == user_id, User.acc_id == acc.id).with_for_update()
+    result = await db.execute(sq)
+    return result.one_or_none()
+
+
+def search_document():
+    """
+    Вираз з полями користувача, за яким виконується пошук.
+
+    Має збігатися з виразом індексу ``ix_users_search_trgm`` з міграції 9a4e6f2b8d15; роздільник
+    вбудовано в SQL як літерал, щоб вираз запиту не містив параметрів.
+    """
+    sep = literal_column("' '")
+    return func.lower(User.first_name + sep + User.last_name + sep + User.email + sep + User.phone_number)
+
+
+def _like_pattern(value: str, prefix_only: bool = False) -> str:
+    escaped = value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"{escaped}%" if prefix_only else f"%{escaped}%"
+
+
+async def search_users(q: str, limit: int, offset: int, db: AsyncSession, acc: Account,
+                       columns: list[str] | None = None, include_acc: bool = True):
+    """
+    Знайти користувачів облікового запису за фрагментом імені, прізвища, email або телефону.
+
+    На PostgreSQL умова ``LIKE '%q%'`` використовує триграмний GIN-індекс, а серед результатів з однаковим
+    рангом вищими йдуть ті, що мають більшу ``word_similarity``. На SQLite виконується той самий LIKE
+    серед користувачів облікового запису без окремого індексу.
+
+    :param q: Пошуковий рядок.
+    :type q: str
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених результатів.
+    :type offset: int
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, серед користувачів якого виконується пошук.
+    :type acc: Account
+    :param columns: Назви колонок користувача для завантаження або None для всіх колонок.
+    :type columns: list[str] | None
+    :param include_acc: Чи приєднувати обліковий запис користувача.
+    :type include_acc: bool
+    :return: Список користувачів, упорядкований за релевантністю.
+    """
+    q = " ".join(q.lower().split())
+    document = search_document()
+    prefix = _like_pattern(q, prefix_only=True)
+    # Збіг з початком імені чи прізвища важливіший за збіг з початком email чи телефону, а той — за збіг усередині.
+    rank = case(
+        (or_(func.lower(User.first_name).like(prefix, escape="/"),
+             func.lower(User.last_name).like(prefix, escape="/")), 2),
+        (or_(func.lower(User.email).like(prefix, escape="/"), User.phone_number.like(prefix, escape="/")), 1),
+        else_=0,
+    )
+    order = [rank.desc()]
+    if db.get_bind().dialect.name == "postgresql":
+        order.append(func.word_similarity(q, document).desc())
+    sq = (_select_users(columns, include_acc)
+          .where(User.acc_id == acc.id, document.like(_like_pattern(q), escape="/"))
+          .order_by(*order, User.id)
+          .offset(offset).limit(limit))
+    users = await db.execute(sq)
+    return users.scalars().all()
+
+
+async def get_upcoming_birthdays(days: int, limit: int, offset: int, db: AsyncSession, acc: Account, today: date,
+                                 columns: list[str] | None = None, include_acc: bool = True):
+    """
+    Отримати користувачів облікового запису, чий день народження припадає на найближчі ``days`` днів.
+
+    Умова на ``birth_doy`` — один або, якщо вікно переходить через кінець року, два діапазони індексу
+    ``ix_users_acc_id_birth_doy``. Результати впорядковані від найближчого дня народження.
+
+    :param days: Кількість днів після ``today``, включно.
+    :type days: int
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених результатів.
+    :type offset: int
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, до якого належать користувачі.
+    :type acc: Account
+    :param today: Перший день вікна.
+    :type today: date
+    :param columns: Назви колонок користувача для завантаження або None для всіх колонок.
+    :type columns: list[str] | None
+    :param include_acc: Чи приєднувати обліковий запис користувача.
+    :type include_acc: bool
+    :return: Список користувачів.
+    """
+    ranges = birthday_window(today, days)
+    # Для вікна на весь рік діапазон починається з 1, тож відлік ведеться від самого ``today``.
+    start = day_of_year(today)
+    in_window = or_(*(User.birth_doy.between(low, high) for low, high in ranges))
+    days_until = case((User.birth_doy >= start, User.birth_doy - start), else_=User.birth_doy + DAYS_IN_YEAR - start)
+    sq = (_select_users(columns, include_acc)
+          .where(User.acc_id == acc.id, in_window)
+          .order_by(days_until, User.id)
+          .offset(offset).limit(limit))
     users = await db.execute(sq)
     return users.scalars().all()
 
 
-async def get_user(user_id: int, db: AsyncSession, acc: Account):
+async def stream_users(db: AsyncSession, acc: Account | None = None, batch_size: int = 1000) -> AsyncIterator[Row]:
+    """
+    Потоково отримати користувачів без завантаження всієї вибірки в пам'ять.
+
+    Вибираються лише колонки ``EXPORT_COLUMNS`` без приєднання облікового запису; рядки читаються
+    з бази пакетами по ``batch_size``.
+
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, користувачів якого потрібно експортувати, або None для всіх користувачів.
+    :type acc: Account | None
+    :param batch_size: Кількість рядків, що читаються з бази за один раз.
+    :type batch_size: int
+    :return: Асинхронний потік рядків з колонками ``EXPORT_COLUMNS``.
+    """
+    sq = select(*EXPORT_COLUMNS).order_by(User.id).execution_options(yield_per=batch_size)
+    if acc is not None:
+        sq = sq.where(User.acc_id == acc.id)
+    result = await db.stream(sq)
+    async for row in result:
+        yield row
+
+
+async def get_user(user_id: int, db: AsyncSession, acc: Account, columns: list[str] | None = None,
+                   include_acc: bool = True):
     """
     Отримати користувача за ідентифікатором для певного облікового запису.
 
@@ -61,9 +326,13 @@ async def get_user(user_id: int, db: AsyncSession, acc: Account):
     :type db: AsyncSession
     :param acc: Обліковий запис, до якого належить ідентифікатор користувача.
     :type acc: Account
+    :param columns: Назви колонок користувача для завантаження або None для всіх колонок.
+    :type columns: list[str] | None
+    :param include_acc: Чи приєднувати обліковий запис користувача.
+    :type include_acc: bool
     :return: Користувач за ідентифікатором.
     """
-    sq = select(User).filter_by(id=user_id, acc=acc)
+    sq = _select_users(columns, include_acc).where(User.id == user_id, User.acc_id == acc.id)
     user = await db.execute(sq)
     return user.scalar_one_or_none()
 
@@ -81,15 +350,41 @@ async def create_user(body: UserSchema, db: AsyncSession, acc: Account):
     :return: Створений користувач.
     """
     user = User(first_name=body.first_name, last_name=body.last_name, email=body.email, phone_number=body.phone_number,
-                birthday=body.birthday, acc=acc)
+                birthday=body.birthday, **birthday_fields(body.birthday), acc=acc)
     if body.data:
         user.data = body.data
     db.add(user)
     await db.commit()
+    await user_list_cache.invalidate(acc.id)
     await db.refresh(user)
     return user
 
 
+async def create_users(bodies: list[UserSchema], db: AsyncSession, acc: Account) -> list[int]:
+    """
+    Створити пакет користувачів для певного облікового запису одним багаторядковим INSERT ... RETURNING.
+
+    :param bodies: Схеми з даними для створення користувачів.
+    :type bodies: list[UserSchema]
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, до якого належать створені користувачі.
+    :type acc: Account
+    :return: Ідентифікатори створених користувачів у порядку ``bodies``.
+    """
+    if not bodies:
+        return []
+    rows = [dict(first_name=body.first_name, last_name=body.last_name, email=body.email,
+                 phone_number=body.phone_number, birthday=body.birthday, **birthday_fields(body.birthday),
+                 data=bool(body.data), acc_id=acc.id)
+            for body in bodies]
+    result = await db.execute(insert(User).returning(User.id, sort_by_parameter_order=True), rows)
+    ids = list(result.scalars().all())
+    await db.commit()
+    await user_list_cache.invalidate(acc.id)
+    return ids
+
+
 async def update_user(user_id: int, body: UserUpdateSchema, db: AsyncSession, acc: Account):
     """
     Оновити користувача для певного облікового запису.
@@ -104,18 +399,17 @@ async def update_user(user_id: int, body: UserUpdateSchema, db: AsyncSession, ac
     :type acc: Account
     :return: Оновлений користувач.
     """
-    sq = select(User).filter_by(id=user_id, acc=acc)
+    sq = (update(User).where(User.id == user_id, User.acc_id == acc.id)
+          .values(first_name=body.first_name, last_name=body.last_name, email=body.email,
+                  phone_number=body.phone_number, birthday=body.birthday, **birthday_fields(body.birthday),
+                  data=body.data)
+          .returning(User))
     result = await db.execute(sq)
     user = result.scalar_one_or_none()
     if user:
-        user.first_name = body.first_name
-        user.last_name = body.last_name
-        user.email = body.email
-        user.phone_number = body.phone_number
-        user.birthday = body.birthday
-        user.data = body.data
+        set_committed_value(user, "acc", acc)
         await db.commit()
-        await db.refresh(user)
+        await user_list_cache.invalidate(acc.id)
     return user
 
 
@@ -131,10 +425,11 @@ async def remove_user(user_id: int, db: AsyncSession, acc: Account):
     :type acc: Account
     :return: Видалений користувач.
     """
-    sq = select(User).filter_by(id=user_id, acc=acc)
+    sq = delete(User).where(User.id == user_id, User.acc_id == acc.id).returning(User)
     result = await db.execute(sq)
     user = result.scalar_one_or_none()
     if user:
-        await db.delete(user)
+        set_committed_value(user, "acc", acc)
         await db.commit()
+        await user_list_cache.invalidate(acc.id)
     return user
@@ -0,0 +1,43 @@
+"""
+Модуль, який надає функціональність для керування власним обліковим записом.
+
+Цей модуль визначає роутер з функцією для завантаження аватара облікового запису.
+
+.. moduleauthor:: Nevskiy911
+
+"""
+from fastapi import APIRouter, Depends, File, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.database.db import get_db
+from src.database.models import Account
+from src.repository import acc as repository_accs
+from src.schemas import AccountResponseSchema
+from src.services.auth import auth_service
+from src.services.avatars import store_avatar
+
+router = APIRouter(prefix="/accounts", tags=["accounts"])
+
+
+@router.patch("/avatar", response_model=AccountResponseSchema)
+async def update_avatar(file: UploadFile = File(), db: AsyncSession = Depends(get_db),
+                        acc: Account = Depends(auth_service.get_current_acc)):
+    """
+    Завантажити новий аватар облікового запису.
+
+    Зображення обрізається до квадрата і зберігається в кількох розмірах під ``/static/avatars``;
+    обліковий запис отримує URL копії розміру ``avatar_default_size``. Інші розміри доступні за тим самим
+    URL з іншим суфіксом ``-<розмір>.webp``.
+
+    :param file: Файл зображення (PNG, JPEG, GIF або WebP).
+    :type file: UploadFile
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Поточний обліковий запис.
+    :type acc: Account
+    :return: Оновлений обліковий запис.
+    :rtype: AccountResponseSchema
+    """
+    url = await store_avatar(await file.read(config.avatar_max_bytes + 1))
+    return await repository_accs.update_avatar(acc.email, url, db)
@@ -10,16 +10,19 @@
 
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Depends, status, Security, Request, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, status, Security, Request
 from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials, HTTPBearer
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
+from src.database.models import Account
 from src.schemas import AccountSchema, AccountResponseSchema, TokenModel
 from src.repository import acc as repository_accs
+from src.repository import outbox as repository_outbox
+from src.repository import tokens as repository_tokens
 from src.services.auth import auth_service
-from src.services.email import send_email
+from src.services.rate_limit import rate_limiter
 from src.conf import messages
 
 router = APIRouter(prefix='/auth', tags=["auth"])
@@ -27,79 +30,123 @@ security = HTTPBearer()
 
 
 @router.post("/signup", response_model=AccountResponseSchema, status_code=status.HTTP_201_CREATED)
-async def signup(body: AccountSchema, background_tasks: BackgroundTasks, request: Request, db: AsyncSession = Depends(get_db)):
+async def signup(body: AccountSchema, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Зареєструвати нового користувача.
 
+    Лист підтвердження додається до черги ``email_outbox`` в одній транзакції з обліковим записом
+    і відправляється обробником :mod:`src.services.email_worker`.
+
     :param body: Дані для створення облікового запису.
     :type body: AccountSchema
-    :param background_tasks: Фонові завдання.
-    :type background_tasks: BackgroundTasks
     :param request: Об'єкт запиту.
     :type request: Request
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
     :return: Створений обліковий запис.
     """
+    await rate_limiter.check("signup", request, body.email)
     exist_acc = await repository_accs.get_acc_by_email(body.email, db)
     if exist_acc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=messages.ACCOUNT_EXISTS)
-    body.password = auth_service.get_password_hash(body.password)
+    body.password = await auth_service.hash_password_async(body.password)
+    repository_outbox.enqueue_confirmation(body.email, body.username, str(request.base_url), db)
     new_acc = await repository_accs.create_acc(body, db)
-    background_tasks.add_task(send_email, new_acc.email, new_acc.username, str(request.base_url))
     return new_acc
 
 
 @router.post("/login", response_model=TokenModel)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login(request: Request, body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Аутентифікація користувача та отримання токенів доступу.
 
+    :param request: Об'єкт запиту.
+    :type request: Request
     :param body: Форма запиту з даними аутентифікації.
     :type body: OAuth2PasswordRequestForm
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
     :return: Модель токенів доступу.
     """
+    await rate_limiter.check("login", request, body.username)
     acc = await repository_accs.get_acc_by_email(body.username, db)
     if acc is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=messages.INVALID_EMAIL)
     if not acc.confirmed:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=messages.EMAIL_NOT_CONFIRMED)
-    if not auth_service.verify_password(body.password, acc.password):
+    if not await auth_service.verify_password_async(body.password, acc.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=messages.INVALID_PASS)
     # Generate JWT
     access_token = await auth_service.create_access_token(data={"sub": acc.email})
-    refresh_token = await auth_service.create_refresh_token(data={"sub": acc.email})
-    await repository_accs.update_token(acc, refresh_token, db)
+    refresh_token, jti, expires_at = await auth_service.issue_refresh_token(acc.email)
+    await repository_tokens.add_refresh_token(jti, acc.id, expires_at, db)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
 @router.get('/refresh_token', response_model=TokenModel)
-async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security),
+async def refresh_token(request: Request, credentials: HTTPAuthorizationCredentials = Security(security),
                         db: AsyncSession = Depends(get_db)):
     """
     Оновлення токену доступу на основі токену оновлення.
 
+    Використаний токен оновлення замінюється новим. Повторне використання вже заміненого токена
+    вважається крадіжкою, і всі сесії облікового запису відкликаються.
+
+    :param request: Об'єкт запиту.
+    :type request: Request
     :param credentials: Креденшали доступу.
     :type credentials: HTTPAuthorizationCredentials
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
     :return: Модель оновлених токенів доступу.
     """
+    await rate_limiter.check("refresh_token", request)
     token = credentials.credentials
-    email = await auth_service.decode_refresh_token(token)
+    claims = await auth_service.decode_refresh_claims(token)
+    email = claims["sub"]
     user = await repository_accs.get_acc_by_email(email, db)
-    if user.refresh_token != token:
-        await repository_accs.update_token(user, None, db)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=messages.INVALID_REFRESH_TOKEN)
+
+    refresh_token, jti, expires_at = await auth_service.issue_refresh_token(email)
+    acc_id = user.id
+    if not claims.get("jti") or not await repository_tokens.rotate_refresh_token(claims["jti"], jti, acc_id,
+                                                                                 expires_at, db):
+        await repository_tokens.revoke_all_refresh_tokens(acc_id, db)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=messages.INVALID_REFRESH_TOKEN)
 
     access_token = await auth_service.create_access_token(data={"sub": email})
-    refresh_token = await auth_service.create_refresh_token(data={"sub": email})
-    await repository_accs.update_token(user, refresh_token, db)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
+@router.post('/logout', status_code=status.HTTP_204_NO_CONTENT)
+async def logout(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_db)):
+    """
+    Завершити поточну сесію: відкликати переданий токен оновлення.
+
+    :param credentials: Токен оновлення.
+    :type credentials: HTTPAuthorizationCredentials
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    """
+    claims = await auth_service.decode_refresh_claims(credentials.credentials)
+    if claims.get("jti"):
+        await repository_tokens.revoke_refresh_token(claims["jti"], db)
+
+
+@router.post('/logout_all', status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(acc: Account = Depends(auth_service.get_current_acc), db: AsyncSession = Depends(get_db)):
+    """
+    Завершити всі сесії облікового запису: відкликати всі його токени оновлення.
+
+    :param acc: Поточний обліковий запис.
+    :type acc: Account
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    """
+    await repository_tokens.revoke_all_refresh_tokens(acc.id, db)
+
+
 @router.get('/{username}')
 async def refresh_token(username: str, db: AsyncSession = Depends(get_db)):
     """
@@ -122,6 +169,10 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     Підтвердження email користувача.
 
+    Запит змінює дані, але це GET за посиланням з листа, тож ``WriteMarkerMiddleware`` не додає до відповіді
+    ``X-Last-Write``. Маркер тут і не потрібен: вхід та :meth:`Auth.get_current_acc` читають обліковий запис
+    з основної бази.
+
     :param token: Токен підтвердження email.
     :type token: str
     :param db: Асинхронна сесія бази даних.
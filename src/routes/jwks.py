@@ -0,0 +1,29 @@
+"""
+Модуль, який надає відкриті ключі підпису JWT у форматі JWKS.
+
+.. moduleauthor:: Nevskiy911
+
+"""
+from fastapi import APIRouter, Response
+
+from src.services.auth import auth_service
+
+router = APIRouter(tags=["auth"])
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks(response: Response):
+    """
+    Отримати відкриті ключі, якими перевіряються токени доступу.
+
+    Для симетричного алгоритму (HS256) набір порожній: такі токени перевіряє лише цей застосунок.
+
+    :param response: Відповідь, у яку додається заголовок Cache-Control.
+    :type response: Response
+    :return: JSON Web Key Set.
+    :rtype: dict
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    if auth_service.keyring is None:
+        return {"keys": []}
+    return auth_service.keyring.jwks()
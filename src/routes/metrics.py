@@ -0,0 +1,20 @@
+"""
+Модуль, який надає маршрут з метриками застосунку у форматі Prometheus.
+
+.. moduleauthor:: Nevskiy911
+
+"""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Отримати метрики застосунку.
+
+    :return: Метрики у текстовому форматі Prometheus.
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
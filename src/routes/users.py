@@ -8,82 +8,305 @@
 
 """
 
-from typing import List
+import time
+from datetime import date
+from typing import AsyncIterator, Awaitable, Callable, List
 
-from fastapi import APIRouter, HTTPException, Depends, status, Path, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Header, Path, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db, replica_router
 from src.database.models import Account, Role
-from src.schemas import UserResponse, UserSchema, UserUpdateSchema
+from src.conf.config import config
+from src.conf import messages
+from src.schemas import UserResponse, UserSchema, UserUpdateSchema, BulkImportResponse, BulkUserResult
 from src.repository import users as repository_users
 from src.services.auth import auth_service
 from src.services.roles import RoleAccess
+from src.services.cache import user_list_cache
+from src.services.pagination import NEXT_CURSOR_HEADER, decode_cursor, set_next_cursor
+from src.services.export import EXPORT_FORMATS, ndjson_lines, csv_lines
+from src.services.fields import FieldSelection
+from src.services.etag import user_etag, user_versions, row_versions, list_etag, etag_matches, check_if_match
+from src.services.serialization import users_json, json_response
 
 router = APIRouter(prefix='/users', tags=["users"])
 access_to_all = RoleAccess([Role.admin, Role.moderator])
 
 
+async def _users_page(selection: FieldSelection, limit: int, if_none_match: str | None,
+                      load_versions: Callable[[], Awaitable[list]], load_users: Callable[[], Awaitable[list]],
+                      load_rows: Callable[[], Awaitable[list]]) -> Response:
+    """
+    Сформувати відповідь зі сторінкою користувачів з ETag, курсором і вибраними полями.
+
+    Якщо передано If-None-Match, спершу вибираються лише версії записів сторінки, і за незмінної сторінки
+    повертається 304 без завантаження та серіалізації користувачів. Повна форма сторінки серіалізується
+    з рядків бази одразу в JSON, оминаючи перевірку ``response_model``.
+    """
+    if if_none_match:
+        versions = await load_versions()
+        etag = list_etag(versions)
+        if etag_matches(if_none_match, etag):
+            not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            set_next_cursor(not_modified, versions, limit)
+            return not_modified
+    if selection.sparse:
+        users = await load_users()
+        response = JSONResponse([selection.render(user) for user in users],
+                                headers={"ETag": list_etag(user_versions(users, selection.include_acc))})
+    else:
+        users = await load_rows()
+        response = json_response(users_json(users), headers={"ETag": list_etag(row_versions(users))})
+    set_next_cursor(response, users, limit)
+    return response
+
+
+async def _cached_users_page(acc: Account, db: AsyncSession, params: tuple, if_none_match: str | None,
+                             build: Callable[[], Awaitable[Response]]) -> Response:
+    """
+    Віддати сторінку користувачів облікового запису з кешу або сформувати її і зберегти в кеші.
+
+    Сторінка, прочитана з репліки протягом ``replica_lag_window`` після зміни, не зберігається:
+    репліка могла ще не отримати цю зміну.
+    """
+    generation = await user_list_cache.generation(acc.id) if user_list_cache.enabled else None
+    if generation is None:
+        return await build()
+    key = user_list_cache.key(acc.id, generation, *params)
+    cached = await user_list_cache.get(key)
+    if cached is not None:
+        etag, cursor, body = cached
+        headers = {"ETag": etag, NEXT_CURSOR_HEADER: cursor} if cursor else {"ETag": etag}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return json_response(body, headers=headers)
+    response = await build()
+    recently_written = time.time_ns() - generation < config.replica_lag_window * 1e9
+    if response.status_code == status.HTTP_200_OK and not (recently_written and replica_router.owns(db)):
+        await user_list_cache.set(key, response.headers["ETag"], response.headers.get(NEXT_CURSOR_HEADER),
+                                  response.body)
+    return response
+
+
 @router.get("/", response_model=List[UserResponse])
 async def get_users(limit: int = Query(10, ge=10, le=500), offset: int = Query(0, ge=0, le=200),
-                    db: AsyncSession = Depends(get_db), acc: Account = Depends(auth_service.get_current_acc)):
+                    cursor: str | None = Query(None), selection: FieldSelection = Depends(),
+                    if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_read_db),
+                    acc: Account = Depends(auth_service.get_current_acc)):
     """
     Отримати список користувачів для певного облікового запису.
 
+    Курсор наступної сторінки повертається в заголовку ``X-Next-Cursor``. Якщо передано ``cursor``,
+    параметр ``offset`` ігнорується. Параметри ``fields`` та ``include`` обмежують поля відповіді.
+    Відповідь має ETag сторінки; якщо він збігається з If-None-Match, повертається 304.
+    Готові сторінки кешуються (:class:`UserListCache`) до наступної зміни користувачів облікового запису.
+
     :param limit: Максимальна кількість користувачів для повернення.
     :type limit: int
     :param offset: Кількість пропущених користувачів під час генерації.
     :type offset: int
+    :param cursor: Курсор з заголовка ``X-Next-Cursor`` попередньої сторінки.
+    :type cursor: str | None
+    :param selection: Вибрані поля користувача та вкладені об'єкти.
+    :type selection: FieldSelection
+    :param if_none_match: ETag сторінки з попередньої відповіді.
+    :type if_none_match: str | None
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
     :param acc: Обліковий запис, до якого належать користувачі.
     :type acc: Account
     :return: Список користувачів.
     """
-    users = await repository_users.get_users(limit, offset, db, acc)
-    return users
+    after_id = decode_cursor(cursor) if cursor else None
+    params = (limit, offset, cursor, ",".join(selection.columns or ["*"]), selection.include_acc, selection.sparse)
+    return await _cached_users_page(acc, db, params, if_none_match, lambda: _users_page(
+        selection, limit, if_none_match,
+        lambda: repository_users.get_user_versions(limit, offset, db, acc, after_id, selection.include_acc),
+        lambda: repository_users.get_users(limit, offset, db, acc, after_id, selection.columns,
+                                           selection.include_acc),
+        lambda: repository_users.get_user_rows(limit, offset, db, acc, after_id)))
 
 
 @router.get("/all", response_model=List[UserResponse], dependencies=[Depends(access_to_all)])
 async def get_users(limit: int = Query(10, ge=10, le=500), offset: int = Query(0, ge=0, le=200),
-                    db: AsyncSession = Depends(get_db), acc: Account = Depends(auth_service.get_current_acc)):
+                    cursor: str | None = Query(None), selection: FieldSelection = Depends(),
+                    if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_read_db),
+                    acc: Account = Depends(auth_service.get_current_acc)):
     """
     Отримати список всіх користувачів (доступно адміністраторам та модераторам).
 
+    Курсор наступної сторінки повертається в заголовку ``X-Next-Cursor``. Якщо передано ``cursor``,
+    параметр ``offset`` ігнорується. Параметри ``fields`` та ``include`` обмежують поля відповіді.
+    Відповідь має ETag сторінки; якщо він збігається з If-None-Match, повертається 304.
+
     :param limit: Максимальна кількість користувачів для повернення.
     :type limit: int
     :param offset: Кількість пропущених користувачів під час генерації.
     :type offset: int
+    :param cursor: Курсор з заголовка ``X-Next-Cursor`` попередньої сторінки.
+    :type cursor: str | None
+    :param selection: Вибрані поля користувача та вкладені об'єкти.
+    :type selection: FieldSelection
+    :param if_none_match: ETag сторінки з попередньої відповіді.
+    :type if_none_match: str | None
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
     :param acc: Обліковий запис, до якого належать користувачі.
     :type acc: Account
     :return: Список користувачів.
     """
-    users = await repository_users.get_all_users(limit, offset, db)
+    after_id = decode_cursor(cursor) if cursor else None
+    return await _users_page(
+        selection, limit, if_none_match,
+        lambda: repository_users.get_user_versions(limit, offset, db, None, after_id, selection.include_acc),
+        lambda: repository_users.get_all_users(limit, offset, db, after_id, selection.columns,
+                                               selection.include_acc),
+        lambda: repository_users.get_user_rows(limit, offset, db, None, after_id))
+
+
+@router.get("/search", response_model=List[UserResponse])
+async def search_users(q: str = Query(min_length=1, max_length=100, pattern=r"\S"),
+                       limit: int = Query(10, ge=10, le=500), offset: int = Query(0, ge=0, le=200),
+                       selection: FieldSelection = Depends(),
+                       db: AsyncSession = Depends(get_read_db), acc: Account = Depends(auth_service.get_current_acc)):
+    """
+    Знайти користувачів облікового запису за фрагментом імені, прізвища, email або номера телефону.
+
+    Результати впорядковані за релевантністю: спершу збіги з початком імені чи прізвища, потім з початком
+    email чи телефону, потім решта.
+
+    :param q: Пошуковий рядок; рядок лише з пробілів відхиляється з кодом 422.
+    :type q: str
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених результатів.
+    :type offset: int
+    :param selection: Вибрані поля користувача та вкладені об'єкти.
+    :type selection: FieldSelection
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, серед користувачів якого виконується пошук.
+    :type acc: Account
+    :return: Список знайдених користувачів.
+    """
+    users = await repository_users.search_users(q, limit, offset, db, acc, selection.columns, selection.include_acc)
+    if selection.sparse:
+        return JSONResponse([selection.render(user) for user in users])
+    return users
+
+
+@router.get("/birthdays", response_model=List[UserResponse])
+async def get_upcoming_birthdays(days: int = Query(7, ge=0, le=365), limit: int = Query(10, ge=10, le=500),
+                                 offset: int = Query(0, ge=0, le=200), selection: FieldSelection = Depends(),
+                                 db: AsyncSession = Depends(get_read_db),
+                                 acc: Account = Depends(auth_service.get_current_acc)):
+    """
+    Отримати користувачів, чий день народження припадає на сьогодні або найближчі ``days`` днів.
+
+    Користувачі впорядковані від найближчого дня народження. Записи, день народження яких не вдалося
+    розібрати як дату, не повертаються.
+
+    :param days: Кількість днів після сьогоднішнього.
+    :type days: int
+    :param limit: Максимальна кількість користувачів для повернення.
+    :type limit: int
+    :param offset: Кількість пропущених результатів.
+    :type offset: int
+    :param selection: Вибрані поля користувача та вкладені об'єкти.
+    :type selection: FieldSelection
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, до якого належать користувачі.
+    :type acc: Account
+    :return: Список користувачів.
+    """
+    users = await repository_users.get_upcoming_birthdays(days, limit, offset, db, acc, date.today(),
+                                                          selection.columns, selection.include_acc)
+    if selection.sparse:
+        return JSONResponse([selection.render(user) for user in users])
     return users
 
 
+def _export_response(db: AsyncSession, acc: Account | None, export_format: str) -> StreamingResponse:
+    rows = repository_users.stream_users(db, acc, config.export_batch_size)
+    if export_format == "csv":
+        lines = csv_lines(rows, [column.key for column in repository_users.EXPORT_COLUMNS])
+    else:
+        lines = ndjson_lines(rows)
+    return StreamingResponse(lines, media_type=EXPORT_FORMATS[export_format],
+                             headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'})
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                       db: AsyncSession = Depends(get_read_db), acc: Account = Depends(auth_service.get_current_acc)):
+    """
+    Експортувати всіх користувачів облікового запису потоком NDJSON або CSV.
+
+    :param export_format: Формат експорту: ``ndjson`` або ``csv``.
+    :type export_format: str
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, до якого належать користувачі.
+    :type acc: Account
+    :return: Потокова відповідь з користувачами.
+    """
+    return _export_response(db, acc, export_format)
+
+
+@router.get("/all/export", response_class=StreamingResponse, dependencies=[Depends(access_to_all)])
+async def export_all_users(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                           db: AsyncSession = Depends(get_read_db)):
+    """
+    Експортувати всіх користувачів потоком NDJSON або CSV (доступно адміністраторам та модераторам).
+
+    :param export_format: Формат експорту: ``ndjson`` або ``csv``.
+    :type export_format: str
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    :return: Потокова відповідь з користувачами.
+    """
+    return _export_response(db, None, export_format)
+
+
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int = Path(ge=1), db: AsyncSession = Depends(get_db),
+async def get_user(response: Response, user_id: int = Path(ge=1), selection: FieldSelection = Depends(),
+                   if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_read_db),
                    acc: Account = Depends(auth_service.get_current_acc)):
     """
     Отримати деталі користувача за ідентифікатором.
 
+    Відповідь має ETag користувача; якщо він збігається з If-None-Match, повертається 304.
+
+    :param response: Об'єкт відповіді.
+    :type response: Response
     :param user_id: Ідентифікатор користувача.
     :type user_id: int
+    :param selection: Вибрані поля користувача та вкладені об'єкти.
+    :type selection: FieldSelection
+    :param if_none_match: ETag користувача з попередньої відповіді.
+    :type if_none_match: str | None
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
     :param acc: Обліковий запис, до якого належить користувач.
     :type acc: Account
     :return: Деталі користувача.
     """
-    user = await repository_users.get_user(user_id, db, acc)
+    user = await repository_users.get_user(user_id, db, acc, selection.columns, selection.include_acc)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    etag = user_etag(user.id, user.updated_at, user.acc.updated_at if selection.include_acc and user.acc else None)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if selection.sparse:
+        return JSONResponse(selection.render(user), headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return user
 
 
@@ -105,45 +328,145 @@ async def create_user(body: UserSchema, db: AsyncSession = Depends(get_db),
     return user
 
 
+async def _json_items(request: Request) -> AsyncIterator:
+    try:
+        items = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_BULK_BODY)
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_BULK_BODY)
+    for item in items:
+        yield item
+
+
+async def _ndjson_items(request: Request) -> AsyncIterator:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def _validate(item) -> UserSchema:
+    if isinstance(item, bytes):
+        return UserSchema.model_validate_json(item)
+    return UserSchema.model_validate(item)
+
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def import_users(request: Request, db: AsyncSession = Depends(get_db),
+                       acc: Account = Depends(auth_service.get_current_acc)):
+    """
+    Імпортувати користувачів пакетами.
+
+    Тіло запиту — JSON-масив або NDJSON-потік (``Content-Type: application/x-ndjson``) об'єктів ``UserSchema``.
+    Коректні рядки вставляються пакетами по ``bulk_insert_batch_size`` одним INSERT ... RETURNING,
+    некоректні повертаються з переліком помилок.
+
+    :param request: Об'єкт запиту.
+    :type request: Request
+    :param db: Асинхронна сесія бази даних.
+    :type db: AsyncSession
+    :param acc: Обліковий запис, до якого належать користувачі.
+    :type acc: Account
+    :return: Результат імпорту для кожного рядка.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        items = _ndjson_items(request)
+    else:
+        items = _json_items(request)
+
+    results: list[BulkUserResult] = []
+    batch: list[tuple[BulkUserResult, UserSchema]] = []
+
+    async def flush():
+        ids = await repository_users.create_users([body for _, body in batch], db, acc)
+        for (result, _), user_id in zip(batch, ids):
+            result.id = user_id
+        batch.clear()
+
+    index = 0
+    async for item in items:
+        result = BulkUserResult(index=index)
+        results.append(result)
+        index += 1
+        try:
+            batch.append((result, _validate(item)))
+        except ValidationError as err:
+            result.errors = [f"{'.'.join(map(str, e['loc'])) or 'body'}: {e['msg']}" for e in err.errors()]
+            continue
+        if len(batch) >= config.bulk_insert_batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    failed = sum(result.errors is not None for result in results)
+    return {"created": len(results) - failed, "failed": failed, "results": results}
+
+
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user(body: UserUpdateSchema, user_id: int = Path(ge=1), db: AsyncSession = Depends(get_db),
+async def update_user(response: Response, body: UserUpdateSchema, user_id: int = Path(ge=1),
+                      db: AsyncSession = Depends(get_db), if_match: str | None = Header(None),
                       acc: Account = Depends(auth_service.get_current_acc)):
     """
     Оновити дані користувача.
 
+    З заголовком If-Match користувача буде оновлено, лише якщо його не змінили після отримання цього ETag.
+
+    :param response: Об'єкт відповіді.
+    :type response: Response
     :param body: Нові дані для користувача.
     :type body: UserUpdateSchema
     :param user_id: Ідентифікатор користувача.
     :type user_id: int
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
+    :param if_match: ETag користувача, який клієнт бачив останнім; за розбіжності повертається 412.
+    :type if_match: str | None
     :param acc: Обліковий запис, до якого належить користувач.
     :type acc: Account
     :return: Оновлені дані користувача.
     """
+    if if_match is not None:
+        version = await repository_users.lock_user_version(user_id, db, acc)
+        if version is not None:
+            check_if_match(if_match, user_id, version.updated_at)
     user = await repository_users.update_user(user_id, body, db, acc)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    response.headers["ETag"] = user_etag(user.id, user.updated_at, acc.updated_at)
     return user
 
 
 @router.delete("/{user_id}", response_model=UserResponse)
 async def delete_user(user_id: int = Path(ge=1), db: AsyncSession = Depends(get_db),
-                      acc: Account = Depends(auth_service.get_current_acc)):
+                      if_match: str | None = Header(None), acc: Account = Depends(auth_service.get_current_acc)):
     """
     Видалити користувача за ідентифікатором.
 
+    З заголовком If-Match користувача буде видалено, лише якщо його не змінили після отримання цього ETag.
+
     :param user_id: Ідентифікатор користувача.
     :type user_id: int
     :param db: Асинхронна сесія бази даних.
     :type db: AsyncSession
+    :param if_match: ETag користувача, який клієнт бачив останнім; за розбіжності повертається 412.
+    :type if_match: str | None
     :param acc: Обліковий запис, до якого належить користувач.
     :type acc: Account
     :return: Видалений користувач.
     """
+    if if_match is not None:
+        version = await repository_users.lock_user_version(user_id, db, acc)
+        if version is not None:
+            check_if_match(if_match, user_id, version.updated_at)
     user = await repository_users.remove_user(user_id, db, acc)
     if user is None:
         raise HTTPException(
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 
@@ -52,4 +52,16 @@ class UserResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes = True)
     # class Config:
-    #     from_attributes = True # noqa
\ No newline at end of file
+    #     from_attributes = True # noqa
+
+
+class BulkUserResult(BaseModel):
+    index: int
+    id: int | None = None
+    errors: List[str] | None = None
+
+
+class BulkImportResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkUserResult]
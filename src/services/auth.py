@@ -1,23 +1,45 @@
+import time
+import uuid
 from typing import Optional
 
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.repository import acc as repository_accs
+from src.services.cache import account_cache
+from src.services import passwords
+from src.services.keys import KeyRing, keyring
+from src.services.metrics import JWT_DECODE_SECONDS
+from src.services.token_cache import token_cache
 from src.conf.config import config
 from src.conf import messages
 
 
 class Auth:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = passwords.pwd_context
     SECRET_KEY = config.secret_key
     ALGORITHM = config.algorithm
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+    REFRESH_TOKEN_EXPIRE = timedelta(days=7)
+    keyring: KeyRing | None = keyring
+
+    def _encode(self, claims: dict) -> str:
+        if self.keyring is None:
+            return jwt.encode(claims, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        key = self.keyring.active
+        return jwt.encode(claims, key.private_key, algorithm=self.ALGORITHM, headers={"kid": key.kid})
+
+    def _decode(self, token: str) -> dict:
+        if self.keyring is None:
+            return jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+        key = self.keyring.get(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, key.public_key, algorithms=[self.ALGORITHM])
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -25,6 +47,12 @@ class Auth:
     def get_password_hash(self, password: str):
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(self, plain_password, hashed_password):
+        return await passwords.password_pool.run(passwords.verify_password, plain_password, hashed_password)
+
+    async def hash_password_async(self, password: str):
+        return await passwords.password_pool.run(passwords.hash_password, password)
+
     # define a function to generate a new access token
     async def create_access_token(self, data: dict, expires_delta: Optional[float] = None):
         to_encode = data.copy()
@@ -33,7 +61,7 @@ class Auth:
         else:
             expire = datetime.utcnow() + timedelta(minutes=60)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "access_token"})
-        encoded_access_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        encoded_access_token = self._encode(to_encode)
         return encoded_access_token
 
     # define a function to generate a new refresh token
@@ -42,31 +70,42 @@ class Auth:
         if expires_delta:
             expire = datetime.utcnow() + timedelta(seconds=expires_delta)
         else:
-            expire = datetime.utcnow() + timedelta(days=7)
+            expire = datetime.utcnow() + self.REFRESH_TOKEN_EXPIRE
         to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "refresh_token"})
-        encoded_refresh_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        encoded_refresh_token = self._encode(to_encode)
         return encoded_refresh_token
 
-    async def decode_refresh_token(self, refresh_token: str):
+    # define a function to generate a new refresh token with its own id (jti) for the token store
+    async def issue_refresh_token(self, email: str):
+        jti = uuid.uuid4().hex
+        expires_at = datetime.utcnow() + self.REFRESH_TOKEN_EXPIRE
+        refresh_token = await self.create_refresh_token(data={"sub": email, "jti": jti},
+                                                        expires_delta=self.REFRESH_TOKEN_EXPIRE.total_seconds())
+        return refresh_token, jti, expires_at
+
+    async def decode_refresh_claims(self, refresh_token: str):
         try:
-            payload = jwt.decode(refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self._decode(refresh_token)
             if payload['scope'] == 'refresh_token':
-                email = payload['sub']
-                return email
+                return payload
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=messages.INVALID_SCOPE_TOKEN)
         except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate credentials')
 
+    async def decode_refresh_token(self, refresh_token: str):
+        payload = await self.decode_refresh_claims(refresh_token)
+        return payload['sub']
+
     def create_email_token(self, data: dict):
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=7)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire})
-        token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        token = self._encode(to_encode)
         return token
 
     async def get_email_from_token(self, token: str):
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self._decode(token)
             email = payload["sub"]
             return email
         except JWTError as e:
@@ -82,8 +121,14 @@ class Auth:
         )
 
         try:
-            # Decode JWT
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = token_cache.get(token)
+            if payload is None:
+                # Decode JWT
+                started = time.perf_counter()
+                payload = self._decode(token)
+                JWT_DECODE_SECONDS.observe(time.perf_counter() - started)
+                if payload.get('scope') == 'access_token':
+                    token_cache.set(token, payload)
             if payload['scope'] == 'access_token':
                 email = payload["sub"]
                 if email is None:
@@ -93,9 +138,14 @@ class Auth:
         except JWTError as e:
             raise credentials_exception
 
-        acc = await repository_accs.get_acc_by_email(email, db)
+        acc = await account_cache.get(email)
         if acc is None:
-            raise credentials_exception
+            # Обліковий запис читається з основної бази: рядок з репліки, що відстає, лишився б у кеші
+            # на account_cache_ttl, довше за replica_lag_window.
+            acc = await repository_accs.get_acc_by_email(email, db)
+            if acc is None:
+                raise credentials_exception
+            await account_cache.set(acc)
         return acc
 
 
@@ -0,0 +1,120 @@
+"""
+Модуль для аватарів облікових записів.
+
+URL Gravatar обчислюється локально з MD5 нормалізованого email, без мережевих запитів. Завантажені аватари
+обрізаються до квадрата, зменшуються до розмірів ``avatar_sizes`` і зберігаються як WebP під ``/static/avatars``
+з іменем за SHA-256 вмісту (``<дайджест>-<розмір>.webp``). Такі файли ніколи не змінюються, тож віддаються
+з ``Cache-Control: immutable``. Обробка зображень потребує Pillow, яке є необов'язковою залежністю.
+"""
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from fastapi.staticfiles import StaticFiles
+
+from src.conf.config import config
+from src.conf import messages
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow не встановлено
+    Image = None
+
+GRAVATAR_URL = "https://www.gravatar.com/avatar/"
+AVATARS_PREFIX = "avatars"
+AVATAR_FORMATS = {"PNG", "JPEG", "GIF", "WEBP"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@lru_cache(maxsize=4096)
+def gravatar_url(email: str, size: int | None = None) -> str:
+    """
+    URL зображення Gravatar для email.
+
+    :param email: Email облікового запису.
+    :param size: Розмір зображення в пікселях; без нього Gravatar віддає 80×80.
+    :return: URL зображення.
+    """
+    digest = hashlib.md5(email.strip().lower().encode()).hexdigest()
+    return f"{GRAVATAR_URL}{digest}" + (f"?size={size}" if size else "")
+
+
+def avatar_url(digest: str, size: int) -> str:
+    return f"/static/{AVATARS_PREFIX}/{digest}-{size}.webp"
+
+
+def _write(path: str, data: bytes) -> None:
+    if os.path.exists(path):
+        return
+    # Окремий тимчасовий файл на кожен запис: одночасні завантаження того ж зображення не заважають одне одному.
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as fh:
+        fh.write(data)
+    os.replace(fh.name, path)
+
+
+def render_avatar(data: bytes, directory: str, sizes: list[int]) -> str:
+    """
+    Зберегти зменшені копії зображення, названі за дайджестом вмісту.
+
+    :param data: Вміст завантаженого файлу.
+    :param directory: Каталог для файлів аватарів.
+    :param sizes: Розміри сторони квадрата в пікселях.
+    :return: Дайджест, з якого складаються імена файлів.
+    :raises ValueError: Якщо дані не є зображенням PNG, JPEG, GIF або WebP.
+    """
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    os.makedirs(directory, exist_ok=True)
+    if all(os.path.exists(os.path.join(directory, f"{digest}-{size}.webp")) for size in sizes):
+        return digest
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format not in AVATAR_FORMATS:
+                raise ValueError(f"Unsupported image format: {image.format}")
+            if image.width * image.height > config.avatar_max_pixels:
+                raise ValueError(f"Image is too large: {image.width}x{image.height}")
+            image = ImageOps.exif_transpose(image).convert("RGB")
+    except (OSError, Image.DecompressionBombError) as err:
+        raise ValueError(str(err)) from err
+    side = min(image.size)
+    image = ImageOps.fit(image, (side, side))
+    for size in sizes:
+        buffer = io.BytesIO()
+        image.resize((size, size), Image.LANCZOS).save(buffer, "WEBP", quality=85)
+        _write(os.path.join(directory, f"{digest}-{size}.webp"), buffer.getvalue())
+    return digest
+
+
+async def store_avatar(data: bytes) -> str:
+    """
+    Обробити завантажений аватар у пулі потоків і повернути URL копії розміру ``avatar_default_size``.
+
+    :param data: Вміст завантаженого файлу.
+    :return: URL аватара під ``/static``.
+    :raises HTTPException: 501, якщо Pillow не встановлено; 413 для завеликого файлу; 400, якщо це не зображення.
+    """
+    if Image is None:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=messages.AVATARS_UNAVAILABLE)
+    if len(data) > config.avatar_max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=messages.AVATAR_TOO_LARGE)
+    sizes = sorted(set(config.avatar_sizes) | {config.avatar_default_size})
+    directory = os.path.join(config.static_dir, AVATARS_PREFIX)
+    try:
+        digest = await asyncio.to_thread(render_avatar, data, directory, sizes)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_AVATAR)
+    return avatar_url(digest, config.avatar_default_size)
+
+
+class AvatarStaticFiles(StaticFiles):
+    """
+    Статичні файли, де аватари (адресовані за вмістом) кешуються клієнтами без повторної перевірки.
+    """
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if path.startswith(f"{AVATARS_PREFIX}/") and response.status_code == status.HTTP_200_OK:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,64 @@
+"""
+Модуль для розбору днів народження та обчислення дня року.
+
+``User.birthday`` — довільний рядок, тож для вибірок у SQL поряд зберігаються розібрана дата ``birth_date``
+і день року ``birth_doy``. День року рахується за високосним роком (29 лютого — 60, 1 березня — 61 у будь-якому
+році), щоб одна дата завжди мала один і той самий номер.
+"""
+from datetime import date, datetime, timedelta
+
+BIRTHDAY_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+DAYS_IN_YEAR = 366
+LEAP_REFERENCE_YEAR = 2000
+
+
+def parse_birthday(value: str | None) -> date | None:
+    """
+    Розібрати день народження у форматах ДД.ММ.РРРР, РРРР-ММ-ДД, ДД/ММ/РРРР або ДД-ММ-РРРР.
+
+    :param value: Рядок з днем народження.
+    :return: Дата або None, якщо рядок не вдалося розібрати.
+    """
+    if not value:
+        return None
+    for fmt in BIRTHDAY_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def day_of_year(value: date) -> int:
+    """
+    День року дати за високосним роком (1–366).
+    """
+    return date(LEAP_REFERENCE_YEAR, value.month, value.day).timetuple().tm_yday
+
+
+def birthday_fields(birthday: str | None) -> dict:
+    """
+    Значення колонок ``birth_date`` та ``birth_doy`` для рядка з днем народження.
+    """
+    birth_date = parse_birthday(birthday)
+    return {"birth_date": birth_date, "birth_doy": day_of_year(birth_date) if birth_date else None}
+
+
+def birthday_window(today: date, days: int) -> list[tuple[int, int]]:
+    """
+    Діапазони ``birth_doy`` для днів народження від ``today`` до ``today + days`` включно.
+
+    Кінець вікна береться з календаря, тож у невисокосний рік вікно з 28 лютого на один день охоплює і 29 лютого,
+    і 1 березня. Якщо вікно переходить через кінець року, повертаються два діапазони.
+
+    :param today: Перший день вікна.
+    :param days: Кількість днів після ``today``.
+    :return: Список діапазонів ``(від, до)`` включно.
+    """
+    if days >= DAYS_IN_YEAR - 1:
+        return [(1, DAYS_IN_YEAR)]
+    start = day_of_year(today)
+    end = day_of_year(today + timedelta(days=days))
+    if start <= end:
+        return [(start, end)]
+    return [(start, DAYS_IN_YEAR), (1, end)]
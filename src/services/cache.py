@@ -0,0 +1,247 @@
+"""
+Модуль кешування на базі Redis.
+
+Містить клієнт Redis, створений з налаштувань, його внутрішньопроцесну заміну для тестів та
+середовищ без Redis, кеш облікових записів для :meth:`Auth.get_current_acc` і кеш сторінок
+користувачів облікового запису.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.conf.config import config
+from src.database.models import Account, Role
+from src.services.metrics import USER_LIST_CACHE_REQUESTS
+
+
+class MemoryRedis:
+    """
+    Внутрішньопроцесна заміна для тієї підмножини команд ``redis.asyncio.Redis``, яку використовує застосунок.
+
+    :param maxsize: Найбільша кількість ключів; після неї витісняються найдавніше використані. None — без обмеження.
+    """
+    def __init__(self, maxsize: int | None = None):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    def _alive(self, key: str):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return item
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> bytes | None:
+        item = self._alive(key)
+        if item is None:
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    async def set(self, key: str, value, ex: int | None = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode()
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def flushdb(self) -> bool:
+        self._data.clear()
+        return True
+
+
+def create_redis():
+    """
+    Створити клієнт Redis з налаштувань або внутрішньопроцесну заміну, якщо Redis вимкнено.
+
+    :return: Асинхронний клієнт Redis або :class:`MemoryRedis`.
+    """
+    if not config.redis_enabled:
+        return MemoryRedis()
+    return redis.Redis(host=config.redis_host, port=config.redis_port, db=config.redis_db,
+                       password=config.redis_password)
+
+
+redis_client = create_redis()
+
+
+class AccountCache:
+    """
+    Кеш серіалізованих облікових записів за email з обмеженим часом життя.
+
+    Помилки Redis не зупиняють запит: кеш поводиться як промах, і обліковий запис читається з бази даних.
+    """
+    prefix = "acc:"
+
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, email: str) -> str:
+        return f"{self.prefix}{email}"
+
+    @staticmethod
+    def dumps(acc: Account) -> str:
+        return json.dumps({
+            "id": acc.id,
+            "username": acc.username,
+            "email": acc.email,
+            "avatar": acc.avatar,
+            "role": acc.role.value if acc.role else None,
+            "confirmed": acc.confirmed,
+            "created_at": acc.created_at.isoformat() if acc.created_at else None,
+            "updated_at": acc.updated_at.isoformat() if acc.updated_at else None,
+        })
+
+    @staticmethod
+    def loads(raw: bytes | str) -> Account:
+        data = json.loads(raw)
+        for field in ("created_at", "updated_at"):
+            if data[field]:
+                data[field] = datetime.fromisoformat(data[field])
+        if data["role"]:
+            data["role"] = Role(data["role"])
+        acc = Account(**data)
+        # password та refresh_token не кешуються: вони лишаються незавантаженими
+        # і будуть прочитані з бази, якщо об'єкт приєднають до сесії.
+        make_transient_to_detached(acc)
+        return acc
+
+    async def get(self, email: str) -> Account | None:
+        try:
+            raw = await self.client.get(self._key(email))
+        except RedisError as err:
+            logging.warning(err)
+            return None
+        return self.loads(raw) if raw else None
+
+    async def set(self, acc: Account) -> None:
+        try:
+            await self.client.set(self._key(acc.email), self.dumps(acc), ex=self.ttl)
+        except RedisError as err:
+            logging.warning(err)
+
+    async def invalidate(self, email: str) -> None:
+        try:
+            await self.client.delete(self._key(email))
+        except RedisError as err:
+            logging.warning(err)
+
+
+account_cache = AccountCache(redis_client, config.account_cache_ttl)
+
+
+class UserListCache:
+    """
+    Кеш готових сторінок ``GET /api/users/`` для облікового запису.
+
+    Ключ сторінки містить покоління облікового запису — час останньої зміни його користувачів у наносекундах.
+    Будь-яка зміна записує нове покоління, тож попередні сторінки більше не читаються і зникають за TTL.
+    Без Redis кеш живе в пам'яті процесу з витісненням LRU і скидається лише змінами в цьому ж процесі.
+    """
+    prefix = "users:"
+
+    def __init__(self, client, ttl: int):
+        """
+        :param client: Клієнт Redis або :class:`MemoryRedis`.
+        :param ttl: Час життя сторінки в секундах; 0 вимикає кеш.
+        """
+        self.client = client
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _generation_key(self, acc_id: int) -> str:
+        return f"{self.prefix}gen:{acc_id}"
+
+    async def generation(self, acc_id: int) -> int | None:
+        """
+        Поточне покоління облікового запису.
+
+        :param acc_id: Ідентифікатор облікового запису.
+        :return: Покоління (0, якщо змін ще не було) або None, якщо Redis недоступний.
+        """
+        try:
+            raw = await self.client.get(self._generation_key(acc_id))
+        except RedisError as err:
+            logging.warning(err)
+            return None
+        return int(raw) if raw else 0
+
+    def key(self, acc_id: int, generation: int, *parts) -> str:
+        """
+        Ключ сторінки для покоління ``generation`` та параметрів запиту ``parts``.
+        """
+        return f"{self.prefix}{acc_id}:{generation}:" + ":".join("" if part is None else str(part) for part in parts)
+
+    async def get(self, key: str) -> tuple[str, str | None, bytes] | None:
+        """
+        Отримати сторінку з кешу.
+
+        :param key: Ключ з :meth:`key`.
+        :return: ETag, курсор наступної сторінки та тіло відповіді або None.
+        """
+        try:
+            raw = await self.client.get(key)
+        except RedisError as err:
+            logging.warning(err)
+            raw = None
+        if raw is None:
+            self.misses += 1
+            USER_LIST_CACHE_REQUESTS.labels("miss").inc()
+            return None
+        self.hits += 1
+        USER_LIST_CACHE_REQUESTS.labels("hit").inc()
+        etag, cursor, body = raw.split(b"\n", 2)
+        return etag.decode(), cursor.decode() or None, body
+
+    async def set(self, key: str, etag: str, cursor: str | None, body: bytes) -> None:
+        try:
+            await self.client.set(key, b"\n".join((etag.encode(), (cursor or "").encode(), body)), ex=self.ttl)
+        except RedisError as err:
+            logging.warning(err)
+
+    async def invalidate(self, acc_id: int) -> None:
+        """
+        Почати нове покоління сторінок облікового запису після зміни його користувачів.
+
+        :param acc_id: Ідентифікатор облікового запису.
+        """
+        if not self.enabled:
+            return
+        try:
+            # Покоління має пережити сторінки попереднього покоління, інакше після його зникнення
+            # знову читалися б сторінки покоління 0.
+            await self.client.set(self._generation_key(acc_id), str(time.time_ns()), ex=self.ttl * 2)
+        except RedisError as err:
+            logging.warning(err)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+user_list_cache = UserListCache(redis_client if config.redis_enabled else MemoryRedis(config.user_list_cache_size),
+                                config.user_list_cache_ttl)
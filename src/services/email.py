@@ -1,8 +1,11 @@
+import re
+from email.message import EmailMessage
+from email.utils import formataddr
 from pathlib import Path
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
-from pydantic import EmailStr
+from fastapi_mail import ConnectionConfig
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import escape
 
 from src.services.auth import auth_service
 from src.conf.config import config
@@ -14,25 +17,66 @@ conf = ConnectionConfig(
     MAIL_PORT=config.mail_port,
     MAIL_SERVER=config.mail_server,
     MAIL_FROM_NAME="Register mail",
-    MAIL_STARTTLS=False,
-    MAIL_SSL_TLS=True,
-    USE_CREDENTIALS=True,
+    MAIL_STARTTLS=config.mail_starttls,
+    MAIL_SSL_TLS=config.mail_ssl_tls,
+    USE_CREDENTIALS=config.mail_use_credentials,
     VALIDATE_CERTS=True,
     TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
 )
 
+CONFIRMATION_SUBJECT = "Confirm your email "
+CONFIRMATION_TEMPLATE = "email_template.html"
+
+
+class TemplateRenderer:
+    """
+    Шаблон листа, скомпільований один раз, з кешованими статичними частинами.
+
+    Шаблон рендериться з маркерами замість змінних і розбивається на статичні частини; лист для
+    конкретного отримувача збирається з цих частин та екранованих значень без участі Jinja. Якщо
+    шаблон змінює значення змінних (фільтри), кожен лист рендериться через Jinja. Умови на значення
+    змінних не розпізнаються: маркери завжди непорожні, тож шаблон не повинен їх містити.
+
+    :param folder: Каталог шаблонів.
+    :param name: Назва шаблону.
+    :param variables: Назви змінних шаблону.
+    """
+    def __init__(self, folder: Path, name: str, variables: tuple[str, ...]):
+        self.variables = variables
+        self.template = Environment(loader=FileSystemLoader(folder)).get_template(name)
+        parts = self._split("\x00")
+        self.parts = parts if parts == self._split("\x01") else None
+
+    def _split(self, marker: str) -> list[str]:
+        rendered = self.template.render(**{name: f"{marker}{name}{marker}" for name in self.variables})
+        pattern = re.escape(marker) + "(" + "|".join(map(re.escape, self.variables)) + ")" + re.escape(marker)
+        return re.split(pattern, rendered)
+
+    def render(self, **values: str) -> str:
+        values = {name: escape(value) for name, value in values.items()}
+        if self.parts is None:
+            return self.template.render(**values)
+        parts = self.parts
+        chunks = [parts[0]]
+        for i in range(1, len(parts), 2):
+            chunks.append(values[parts[i]])
+            chunks.append(parts[i + 1])
+        return "".join(chunks)
+
+
+confirmation_renderer = TemplateRenderer(conf.TEMPLATE_FOLDER, CONFIRMATION_TEMPLATE, ("host", "username", "token"))
+
+
+def render_confirmation(email: str, username: str, host: str) -> str:
+    token_verification = auth_service.create_email_token({"sub": email})
+    return confirmation_renderer.render(host=host, username=username, token=token_verification)
+
+
+def build_confirmation_message(email: str, username: str, host: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = CONFIRMATION_SUBJECT
+    message["From"] = formataddr((conf.MAIL_FROM_NAME, conf.MAIL_FROM))
+    message["To"] = email
+    message.set_content(render_confirmation(email, username, host), subtype="html")
+    return message
 
-async def send_email(email: EmailStr, username: str, host: str):
-    try:
-        token_verification = auth_service.create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email ",
-            recipients=[email],
-            template_body={"host": host, "username": username, "token": token_verification},
-            subtype=MessageType.html
-        )
-
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="email_template.html")
-    except ConnectionErrors as err:
-        print(err)
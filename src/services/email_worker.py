@@ -0,0 +1,104 @@
+"""
+Обробник черги листів.
+
+Вибирає з таблиці ``email_outbox`` пакети готових листів, відправляє кожен пакет через одне
+SMTP-з'єднання і планує повторні спроби з експоненційною затримкою.
+
+Запуск: ``python -m src.services.email_worker``.
+"""
+import asyncio
+import logging
+
+import aiosmtplib
+
+from src.conf.config import config
+from src.database.db import sessionmanager
+from src.repository import outbox as repository_outbox
+from src.services.email import build_confirmation_message
+
+logger = logging.getLogger(__name__)
+
+
+def smtp_client() -> aiosmtplib.SMTP:
+    return aiosmtplib.SMTP(hostname=config.mail_server, port=config.mail_port, use_tls=config.mail_ssl_tls,
+                           start_tls=config.mail_starttls)
+
+
+def _retry(message, error: Exception) -> None:
+    logger.warning("Email %s to %s failed: %s", message.id, message.recipient, error)
+    repository_outbox.mark_failed(message, str(error) or type(error).__name__, config.email_max_attempts,
+                                  config.email_retry_base_delay, config.email_retry_max_delay)
+
+
+async def process_batch(db) -> int:
+    """
+    Відправити один пакет листів з черги.
+
+    :param db: Асинхронна сесія бази даних.
+    :return: Кількість оброблених листів.
+    """
+    messages = await repository_outbox.claim_batch(config.email_batch_size, db)
+    if not messages:
+        await db.commit()
+        return 0
+    smtp = smtp_client()
+    try:
+        try:
+            await smtp.connect()
+            if config.mail_use_credentials:
+                await smtp.login(config.mail_username, config.mail_password)
+        except (aiosmtplib.SMTPException, OSError) as err:
+            for message in messages:
+                _retry(message, err)
+        else:
+            for index, message in enumerate(messages):
+                try:
+                    await smtp.send_message(build_confirmation_message(message.recipient, message.username,
+                                                                       message.host))
+                except aiosmtplib.SMTPServerDisconnected as err:
+                    for pending in messages[index:]:
+                        _retry(pending, err)
+                    break
+                except aiosmtplib.SMTPException as err:
+                    _retry(message, err)
+                else:
+                    repository_outbox.mark_sent(message)
+    finally:
+        # З'єднання закривається і тоді, коли після connect() не вдався login().
+        if smtp.is_connected:
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+    await db.commit()
+    return len(messages)
+
+
+async def run_worker(stop: asyncio.Event | None = None) -> None:
+    """
+    Обробляти чергу листів, доки не буде встановлено ``stop``.
+
+    Пакети обробляються один за одним без паузи, поки черга не спорожніє; після цього обробник
+    перевіряє чергу кожні ``email_poll_interval`` секунд.
+
+    :param stop: Подія для зупинки обробника або None, щоб працювати безкінечно.
+    """
+    stop = stop or asyncio.Event()
+    while not stop.is_set():
+        processed = 0
+        try:
+            async with sessionmanager.session() as db:
+                processed = await process_batch(db)
+        except Exception as err:
+            logger.exception(err)
+        if processed:
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=config.email_poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
@@ -0,0 +1,106 @@
+"""
+Модуль для умовних запитів (ETag, If-None-Match, If-Match) до користувачів.
+
+ETag користувача — слабкий тег, що кодує ``(id, updated_at)`` і, якщо у відповіді є вкладений обліковий запис,
+його ``updated_at``. ETag списку — дайджест таких версій усіх записів сторінки, тож він змінюється
+при оновленні, додаванні чи видаленні будь-якого запису сторінки.
+"""
+import hashlib
+from datetime import datetime
+from typing import Iterable
+
+from fastapi import HTTPException, status
+
+from src.conf import messages
+
+VERSION_FORMAT = "%Y%m%d%H%M%S%f"
+
+
+def _version(value: datetime | None) -> str:
+    return value.strftime(VERSION_FORMAT) if value else "0"
+
+
+def _user_tag(user_id: int, updated_at: datetime | None) -> str:
+    return f"u{user_id}-{_version(updated_at)}"
+
+
+def user_etag(user_id: int, updated_at: datetime | None, acc_updated_at: datetime | None = None) -> str:
+    """
+    Слабкий ETag одного користувача.
+
+    :param user_id: Ідентифікатор користувача.
+    :param updated_at: Час останнього оновлення користувача.
+    :param acc_updated_at: Час оновлення вкладеного облікового запису, якщо він є у відповіді.
+    :return: Значення заголовка ETag.
+    """
+    tag = _user_tag(user_id, updated_at)
+    if acc_updated_at is not None:
+        tag += f"-a{_version(acc_updated_at)}"
+    return f'W/"{tag}"'
+
+
+def user_versions(users: Iterable, include_acc: bool) -> list[tuple]:
+    """
+    Версії завантажених користувачів у тому ж вигляді, що повертає ``repository.users.get_user_versions``.
+    """
+    if include_acc:
+        return [(user.id, user.updated_at, user.acc.updated_at if user.acc else None) for user in users]
+    return [(user.id, user.updated_at) for user in users]
+
+
+def row_versions(rows: Iterable) -> list[tuple]:
+    """
+    Версії рядків ``repository.users.get_user_rows`` з вкладеним обліковим записом.
+    """
+    return [(row.id, row.updated_at, row.acc_updated_at) for row in rows]
+
+
+def list_etag(versions: Iterable[tuple]) -> str:
+    """
+    Слабкий ETag сторінки користувачів.
+
+    :param versions: Кортежі ``(id, updated_at[, acc_updated_at])`` записів сторінки.
+    :return: Значення заголовка ETag.
+    """
+    digest = hashlib.sha1()
+    for version in versions:
+        digest.update("|".join(_version(value) if isinstance(value, datetime) or value is None else str(value)
+                               for value in version).encode())
+        digest.update(b";")
+    return f'W/"l{digest.hexdigest()[:20]}"'
+
+
+def _tags(header: str) -> list[str]:
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tags.append(tag.strip('"'))
+    return tags
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    Чи відповідає ETag заголовку If-None-Match (слабке порівняння).
+    """
+    if not header:
+        return False
+    tags = _tags(header)
+    return "*" in tags or _tags(etag)[0] in tags
+
+
+def check_if_match(header: str, user_id: int, updated_at: datetime | None) -> None:
+    """
+    Перевірити заголовок If-Match для зміни користувача.
+
+    Порівнюється лише версія самого користувача, тому підходить ETag будь-якого його подання
+    (з вкладеним обліковим записом або без). Теги слабкі, тому й порівняння слабке.
+
+    :raises HTTPException: 412, якщо користувача змінили після отримання ETag.
+    """
+    expected = _user_tag(user_id, updated_at)
+    tags = _tags(header)
+    if "*" in tags or any(tag.split("-a", 1)[0] == expected for tag in tags):
+        return
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=messages.PRECONDITION_FAILED)
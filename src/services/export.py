@@ -0,0 +1,56 @@
+"""
+Модуль для потокового експорту користувачів у форматах NDJSON та CSV.
+
+Рядки кодуються по одному, тож споживання пам'яті не залежить від кількості користувачів.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterable, AsyncIterator
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_lines(rows: AsyncIterable) -> AsyncIterator[str]:
+    """
+    Закодувати рядки результату як NDJSON, по одному об'єкту на рядок.
+
+    :param rows: Асинхронний потік рядків SQLAlchemy.
+    :return: Асинхронний потік рядків NDJSON.
+    """
+    async for row in rows:
+        yield json.dumps(row._asdict(), default=_default, ensure_ascii=False) + "\n"
+
+
+async def csv_lines(rows: AsyncIterable, columns: list[str]) -> AsyncIterator[str]:
+    """
+    Закодувати рядки результату як CSV із заголовком.
+
+    :param rows: Асинхронний потік рядків SQLAlchemy.
+    :param columns: Назви колонок для заголовка.
+    :return: Асинхронний потік рядків CSV.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(columns)
+    yield flush()
+    async for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, (date, datetime)) else value for value in row)
+        yield flush()
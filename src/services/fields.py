@@ -0,0 +1,60 @@
+"""
+Модуль для вибору полів у відповідях з користувачами (sparse fieldsets).
+
+``fields=first_name,email`` залишає у відповіді лише перелічені колонки (``id`` повертається завжди),
+``include=acc`` додає вкладений обліковий запис. Якщо жоден параметр не задано, відповідь має повну
+форму :class:`UserResponse`. Вибрані поля обмежують і SQL-запит: репозиторій завантажує лише ці колонки
+і не приєднує таблицю облікових записів, якщо її не запитано.
+"""
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+
+from src.conf import messages
+from src.schemas import AccountResponseSchema, UserResponse
+
+USER_FIELDS = tuple(name for name in UserResponse.model_fields if name != "acc")
+INCLUDES = ("acc",)
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class FieldSelection:
+    """
+    Залежність FastAPI, що розбирає параметри ``fields`` та ``include``.
+
+    :ivar columns: Колонки користувача для завантаження або None для всіх колонок.
+    :ivar include_acc: Чи потрібен вкладений обліковий запис.
+    :ivar sparse: Чи задано хоча б один з параметрів; інакше відповідь має повну форму.
+    """
+    def __init__(self,
+                 fields: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(USER_FIELDS)}"),
+                 include: str | None = Query(None, description="Comma-separated related objects: acc")):
+        self.sparse = fields is not None or include is not None
+        self.columns = None
+        if fields is not None:
+            requested = _split(fields)
+            unknown = set(requested) - set(USER_FIELDS)
+            if unknown:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail=f"{messages.INVALID_FIELDS}: {', '.join(sorted(unknown))}")
+            self.columns = ["id"] + [name for name in USER_FIELDS if name in requested and name != "id"]
+        included = _split(include) if include is not None else []
+        unknown = set(included) - set(INCLUDES)
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"{messages.INVALID_FIELDS}: {', '.join(sorted(unknown))}")
+        self.include_acc = not self.sparse or "acc" in included
+
+    def render(self, user) -> dict:
+        """
+        Перетворити користувача на словник лише з вибраними полями.
+
+        :param user: Користувач, завантажений з тими ж ``columns`` та ``include_acc``.
+        :return: JSON-сумісний словник.
+        """
+        data = {name: getattr(user, name) for name in self.columns or USER_FIELDS}
+        if self.include_acc:
+            data["acc"] = AccountResponseSchema.model_validate(user.acc).model_dump() if user.acc else None
+        return jsonable_encoder(data)
@@ -0,0 +1,92 @@
+"""
+Модуль інструментування запитів: затримки маршрутів, запити в обробці та кількість і час SQL-запитів
+на один HTTP-запит.
+
+Вмикається налаштуванням ``metrics_enabled``. Статистика SQL збирається подіями рушія SQLAlchemy
+у змінну контексту поточного запиту.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.services.metrics import (HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT, SQL_STATEMENT_SECONDS,
+                                  SQL_STATEMENTS_PER_REQUEST, SQL_SECONDS_PER_REQUEST)
+
+
+@dataclass
+class RequestStats:
+    """
+    SQL-статистика одного HTTP-запиту.
+    """
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    SQL_STATEMENT_SECONDS.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Підключити до рушія події, що рахують SQL-запити та їхній час.
+
+    :param engine: Асинхронний рушій SQLAlchemy.
+    """
+    target = engine.sync_engine
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """
+    ASGI-проміжний шар, що записує затримку, статус та SQL-статистику кожного HTTP-запиту.
+
+    Маршрут у мітках — шаблон шляху (``/api/users/{user_id}``), а не сам шлях, щоб кількість рядів була обмеженою.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            request_stats.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(scope["method"], path, str(status_code)).observe(elapsed)
+            SQL_STATEMENTS_PER_REQUEST.labels(path).observe(stats.statements)
+            SQL_SECONDS_PER_REQUEST.labels(path).observe(stats.sql_seconds)
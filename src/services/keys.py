@@ -0,0 +1,213 @@
+"""
+Модуль з набором ключів для асиметричного підпису JWT.
+
+Ключі зберігаються як PEM-файли в каталозі ``jwt_keys_dir``: ``<kid>.pem`` — закритий ключ,
+``<kid>.pub.pem`` — відкритий ключ виведеного з обігу ключа, який ще приймається для перевірки.
+Підписує завжди найновіший закритий ключ, а всі відкриті ключі публікуються у форматі JWKS,
+тож інші сервіси можуть перевіряти токени локально, без звернень до цього застосунку.
+
+Ротацію виконує планувальник (cron, Kubernetes CronJob)::
+
+    python -m src.services.keys rotate
+"""
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from jose.backends.base import Key
+
+from src.conf.config import config
+
+RSA_ALGORITHMS = {"RS256", "RS384", "RS512"}
+EC_CURVES = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+ASYMMETRIC_ALGORITHMS = RSA_ALGORITHMS | set(EC_CURVES)
+
+PRIVATE_SUFFIX = ".pem"
+PUBLIC_SUFFIX = ".pub.pem"
+
+
+@dataclass
+class SigningKey:
+    """
+    Ключ з набору: ``private_key`` відсутній у виведених з обігу ключів.
+    """
+    kid: str
+    public_key: Key
+    private_key: Key | None
+    created_at: float
+
+
+class KeyRing:
+    """
+    Набір ключів підпису з каталогу, який перечитується не частіше ніж раз на ``reload_interval`` секунд,
+    щоб усі процеси застосунку підхопили ключ, створений ротацією.
+
+    :param directory: Каталог з PEM-файлами.
+    :param algorithm: Асиметричний алгоритм JWT (RS256, ES256, ...).
+    :param rotation_days: Вік активного ключа, після якого :meth:`rotate` створює новий.
+    :param retention_days: Скільки днів виведений з обігу ключ ще приймається для перевірки.
+    :param reload_interval: Мінімальний інтервал між перевірками каталогу, секунди.
+    """
+    def __init__(self, directory: str | Path, algorithm: str, rotation_days: float, retention_days: float,
+                 reload_interval: float = 60):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported asymmetric JWT algorithm: {algorithm}")
+        self.directory = Path(directory)
+        self.algorithm = algorithm
+        self.rotation_seconds = rotation_days * 86400
+        self.retention_seconds = retention_days * 86400
+        self.reload_interval = reload_interval
+        self._keys: dict[str, SigningKey] = {}
+        self._active: SigningKey | None = None
+        self._checked_at = 0.0
+        self._mtime: float | None = None
+
+    def _construct(self, pem: bytes) -> Key:
+        return jwk.construct(pem, self.algorithm)
+
+    def load(self) -> None:
+        """
+        Перечитати ключі з каталогу.
+        """
+        keys = {}
+        for path in self.directory.glob(f"*{PRIVATE_SUFFIX}"):
+            created_at = path.stat().st_mtime
+            if path.name.endswith(PUBLIC_SUFFIX):
+                kid = path.name[:-len(PUBLIC_SUFFIX)]
+                keys.setdefault(kid, SigningKey(kid, self._construct(path.read_bytes()), None, created_at))
+            else:
+                kid = path.name[:-len(PRIVATE_SUFFIX)]
+                private_key = self._construct(path.read_bytes())
+                keys[kid] = SigningKey(kid, private_key.public_key(), private_key, created_at)
+        self._keys = keys
+        signing = [key for key in keys.values() if key.private_key is not None]
+        self._active = max(signing, key=lambda key: key.created_at) if signing else None
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._checked_at and now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = self.directory.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._mtime or not self._keys:
+            self._mtime = mtime
+            self.load()
+
+    @property
+    def active(self) -> SigningKey:
+        """
+        Ключ, яким підписуються нові токени. Якщо каталог порожній, ключ буде створено.
+        """
+        self._maybe_reload()
+        if self._active is None:
+            self.generate()
+        return self._active
+
+    def get(self, kid: str | None) -> SigningKey | None:
+        """
+        Знайти ключ перевірки за ``kid`` із заголовка токена.
+        """
+        if not kid:
+            return None
+        self._maybe_reload()
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._checked_at > 1:
+            # Токен міг бути підписаний ключем, створеним іншим процесом після останнього читання каталогу.
+            self._checked_at = 0.0
+            self._maybe_reload()
+            key = self._keys.get(kid)
+        return key
+
+    def jwks(self) -> dict:
+        """
+        Відкриті ключі у форматі JSON Web Key Set.
+        """
+        self._maybe_reload()
+        keys = []
+        for key in sorted(self._keys.values(), key=lambda key: key.created_at, reverse=True):
+            data = key.public_key.to_dict()
+            data.update({"kid": key.kid, "use": "sig", "alg": self.algorithm})
+            keys.append(data)
+        return {"keys": keys}
+
+    def _private_pem(self) -> bytes:
+        if self.algorithm in RSA_ALGORITHMS:
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        else:
+            private_key = ec.generate_private_key(EC_CURVES[self.algorithm]())
+        return private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                         serialization.NoEncryption())
+
+    def generate(self) -> SigningKey:
+        """
+        Створити новий ключ і зробити його активним.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        kid = uuid.uuid4().hex
+        path = self.directory / f"{kid}{PRIVATE_SUFFIX}"
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(self._private_pem())
+        os.chmod(tmp, 0o600)
+        tmp.replace(path)
+        self.load()
+        self._mtime = self.directory.stat().st_mtime
+        self._checked_at = time.monotonic()
+        return self._keys[kid]
+
+    def rotate(self, now: float | None = None) -> SigningKey:
+        """
+        Створити новий ключ, якщо активний застарів, вивести з обігу попередні ключі та видалити ті,
+        що вже не можуть перевіряти жодного чинного токена.
+
+        :param now: Поточний час (Unix timestamp), для тестів.
+        :return: Активний ключ.
+        """
+        now = time.time() if now is None else now
+        self.load()
+        if self._active is None or now - self._active.created_at >= self.rotation_seconds:
+            self.generate()
+        ordered = sorted(self._keys.values(), key=lambda key: key.created_at)
+        for key, successor in zip(ordered, ordered[1:]):
+            if now - successor.created_at >= self.retention_seconds:
+                for suffix in (PRIVATE_SUFFIX, PUBLIC_SUFFIX):
+                    (self.directory / f"{key.kid}{suffix}").unlink(missing_ok=True)
+            elif key.private_key is not None:
+                self._retire(key)
+        self.load()
+        return self._active
+
+    def _retire(self, key: SigningKey) -> None:
+        private_path = self.directory / f"{key.kid}{PRIVATE_SUFFIX}"
+        public_path = self.directory / f"{key.kid}{PUBLIC_SUFFIX}"
+        public_path.write_bytes(key.public_key.to_pem())
+        # Час створення ключа зберігається як mtime файлу, тому переносимо його на відкритий ключ.
+        os.utime(public_path, (key.created_at, key.created_at))
+        private_path.unlink(missing_ok=True)
+
+
+def create_keyring() -> KeyRing | None:
+    """
+    Створити набір ключів з налаштувань або None для симетричних алгоритмів (HS256).
+    """
+    if config.algorithm not in ASYMMETRIC_ALGORITHMS:
+        return None
+    return KeyRing(config.jwt_keys_dir, config.algorithm, config.jwt_key_rotation_days,
+                   config.jwt_key_retention_days, config.jwt_keys_reload_interval)
+
+
+keyring = create_keyring()
+
+
+if __name__ == "__main__":
+    if keyring is None or sys.argv[1:] != ["rotate"]:
+        sys.exit("usage: ALGORITHM=RS256 python -m src.services.keys rotate")
+    print(keyring.rotate().kid)
@@ -0,0 +1,176 @@
+"""
+Модуль життєвого циклу застосунку: прогрів під час запуску та плавна зупинка.
+
+Під час запуску відкриваються ``db_pool_warmup`` з'єднань основного пулу та пулів реплік, налаштовуються
+ORM-мапери, виконуються (і потрапляють у кеш компіляції SQLAlchemy) найчастіші запити, а також по одному разу
+хешується пароль у кожному виконавці bcrypt і підписується та перевіряється JWT. Помилки прогріву лише
+записуються в журнал: застосунок запускається, навіть якщо база даних ще недоступна.
+
+Під час зупинки застосунок чекає до ``shutdown_drain_timeout`` секунд на завершення запитів, що виконуються,
+зупиняє вбудований обробник листів (поточний пакет дообробляється, решта лишається в ``email_outbox``),
+після чого закриває пули з'єднань і пул виконавців bcrypt.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from src.conf.config import config
+from src.database import db as database
+from src.database.models import Account
+from src.repository import acc as repository_accs
+from src.repository import users as repository_users
+from src.services import email_worker, passwords
+from src.services.auth import auth_service
+
+logger = logging.getLogger(__name__)
+
+
+class InFlightTracker:
+    """
+    Лічильник HTTP-запитів, що виконуються, з можливістю дочекатися їх завершення.
+    """
+    def __init__(self):
+        self.count = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def started(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def finished(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Дочекатися завершення всіх запитів.
+
+        :param timeout: Найбільший час очікування в секундах.
+        :return: True, якщо всі запити завершились, або False після тайм-ауту.
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+in_flight = InFlightTracker()
+
+
+class InFlightMiddleware:
+    """
+    ASGI-проміжний шар, що рахує запити в :data:`in_flight`, включно з потоковими відповідями.
+    """
+    def __init__(self, app, tracker: InFlightTracker = in_flight):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.tracker.started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.finished()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Відкрити ``connections`` з'єднань одночасно і повернути їх у пул.
+
+    :param engine: Рушій, пул якого прогрівається.
+    :param connections: Кількість з'єднань.
+    :return: Кількість відкритих з'єднань.
+    """
+    results = await asyncio.gather(*(engine.connect().start() for _ in range(connections)), return_exceptions=True)
+    conns = [conn for conn in results if not isinstance(conn, BaseException)]
+    try:
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            await conn.close()
+    errors = [error for error in results if isinstance(error, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(conns)
+
+
+async def warm_statements(db) -> None:
+    """
+    Виконати найчастіші запити, щоб їх скомпільовані форми потрапили в кеш SQLAlchemy.
+
+    Запити виконуються для неіснуючого облікового запису, тож не повертають рядків.
+    """
+    acc = Account(id=0, email="")
+    await repository_accs.get_acc_by_email("", db)
+    await repository_users.get_users(10, 0, db, acc)
+    await repository_users.get_user_rows(10, 0, db, acc)
+    await repository_users.get_user_versions(10, 0, db, acc)
+    await repository_users.get_user(1, db, acc)
+    await db.rollback()
+
+
+async def warm_auth() -> None:
+    """
+    Запустити всі виконавці bcrypt і один раз підписати та перевірити JWT (завантажує ключі підпису).
+    """
+    await asyncio.gather(*(auth_service.hash_password_async("warmup")
+                           for _ in range(passwords.password_pool.workers)))
+    auth_service._decode(await auth_service.create_access_token(data={"sub": "warmup"}))
+
+
+async def warmup() -> None:
+    """
+    Прогріти пули з'єднань, ORM, кеш скомпільованих запитів, bcrypt та JWT.
+    """
+    started = time.perf_counter()
+    configure_mappers()
+    managers = [database.sessionmanager, *database.replica_router.replicas]
+    for manager in managers:
+        try:
+            await warm_pool(manager.engine, config.db_pool_warmup)
+            async with AsyncSession(manager.engine) as db:
+                await warm_statements(db)
+        except Exception as err:
+            logger.warning("Warmup of %s database failed: %s", manager.name, err)
+    try:
+        await warm_auth()
+    except Exception as err:
+        logger.warning("Warmup of auth failed: %s", err)
+    logger.info("Warmup finished in %.2f s", time.perf_counter() - started)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """
+    Обробник життєвого циклу FastAPI: прогрів перед першим запитом і плавна зупинка.
+    """
+    if config.warmup_enabled:
+        await warmup()
+    stop_worker = asyncio.Event()
+    worker = asyncio.create_task(email_worker.run_worker(stop_worker)) if config.email_worker_embedded else None
+    try:
+        yield
+    finally:
+        if not await in_flight.drain(config.shutdown_drain_timeout):
+            logger.warning("Shutting down with %s requests still in flight", in_flight.count)
+        if worker is not None:
+            stop_worker.set()
+            try:
+                await asyncio.wait_for(worker, timeout=config.shutdown_drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Email worker did not stop in time")
+        await database.replica_router.close()
+        await database.sessionmanager.close()
+        await asyncio.to_thread(passwords.password_pool.shutdown)
@@ -0,0 +1,56 @@
+"""
+Модуль з метриками застосунку у форматі Prometheus.
+
+Усі метрики реєструються в типовому реєстрі ``prometheus_client`` і віддаються маршрутом ``/metrics``.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled database connection", ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts", "Connection checkouts that hit pool_timeout", ["pool"],
+)
+DB_POOL_OVERFLOW_CHECKOUTS = Counter(
+    "db_pool_overflow_checkouts", "Connection checkouts served beyond pool_size", ["pool"],
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Pooled database connections by state", ["pool", "state"],
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "HTTP request latency by route", ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+)
+SQL_STATEMENT_SECONDS = Histogram(
+    "sql_statement_seconds", "Execution time of a single SQL statement",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+SQL_STATEMENTS_PER_REQUEST = Histogram(
+    "sql_statements_per_request", "SQL statements executed while serving one HTTP request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+SQL_SECONDS_PER_REQUEST = Histogram(
+    "sql_seconds_per_request", "Total SQL execution time while serving one HTTP request", ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds", "bcrypt hashing and verification time, including pool queueing", ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "bcrypt operations waiting for a free worker",
+)
+JWT_DECODE_SECONDS = Histogram(
+    "jwt_decode_seconds", "Time spent decoding and verifying access tokens",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+JWT_CACHE_REQUESTS = Counter(
+    "jwt_cache_requests", "Decoded access token cache lookups", ["result"],
+)
+USER_LIST_CACHE_REQUESTS = Counter(
+    "user_list_cache_requests", "Cached user list page lookups", ["result"],
+)
@@ -0,0 +1,60 @@
+"""
+Модуль для курсорної (keyset) пагінації.
+
+Курсор — непрозорий для клієнта рядок, що кодує ідентифікатор останнього запису сторінки.
+Наступна сторінка вибирається умовою ``id > last_id`` по індексу, тому її вартість не залежить від глибини.
+"""
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, Response, status
+
+from src.conf import messages
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Закодувати ідентифікатор останнього запису сторінки в курсор.
+
+    :param last_id: Ідентифікатор останнього запису сторінки.
+    :return: Непрозорий курсор.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Розкодувати курсор в ідентифікатор останнього запису попередньої сторінки.
+
+    :param cursor: Курсор, отриманий з попередньої відповіді.
+    :return: Ідентифікатор останнього запису.
+    :raises HTTPException: 400, якщо курсор пошкоджено.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_CURSOR)
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=messages.INVALID_CURSOR)
+    return last_id
+
+
+def set_next_cursor(response: Response, items: list, limit: int) -> str | None:
+    """
+    Додати до відповіді заголовок з курсором наступної сторінки, якщо сторінка заповнена.
+
+    :param response: Відповідь, до якої додається заголовок.
+    :param items: Записи поточної сторінки, впорядковані за ідентифікатором.
+    :param limit: Розмір сторінки.
+    :return: Курсор наступної сторінки або None, якщо це остання сторінка.
+    """
+    if len(items) < limit:
+        return None
+    cursor = encode_cursor(items[-1].id)
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
@@ -0,0 +1,105 @@
+"""
+Модуль для хешування та перевірки паролів у пулі виконавців.
+
+bcrypt займає 100–300 мс процесорного часу на виклик, тому виклики з асинхронних обробників
+виконуються в окремому пулі потоків або процесів з обмеженою чергою, щоб не блокувати цикл подій.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from src.conf.config import config
+from src.conf import messages
+from src.services.metrics import PASSWORD_HASH_SECONDS, PASSWORD_HASH_QUEUE_DEPTH
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHashingPool:
+    """
+    Пул виконавців для bcrypt з обмеженням кількості одночасних операцій та метриками глибини черги.
+
+    :param executor: Тип виконавця: ``thread`` або ``process``.
+    :param workers: Кількість одночасних операцій хешування.
+    :param max_queue: Максимальна кількість операцій, що очікують на вільного виконавця.
+    """
+    def __init__(self, executor: str, workers: int, max_queue: int):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.executor_type = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, func, *args):
+        """
+        Виконати функцію в пулі, не блокуючи цикл подій.
+
+        :raises HTTPException: 503, якщо черга пулу заповнена.
+        """
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=messages.SERVICE_BUSY,
+                                headers={"Retry-After": "1"})
+        self.in_flight += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            self.completed += 1
+            self.busy_seconds += elapsed
+            PASSWORD_HASH_SECONDS.labels(func.__name__).observe(elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "busy_seconds": self.busy_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_pool = PasswordHashingPool(config.password_hash_executor, config.password_hash_workers,
+                                    config.password_hash_max_queue)
+PASSWORD_HASH_QUEUE_DEPTH.set_function(lambda: password_pool.queue_depth)
@@ -0,0 +1,118 @@
+"""
+Модуль обмеження частоти запитів до ендпоінтів аутентифікації за алгоритмом token bucket.
+
+Стан кошиків зберігається в Redis (атомарно, Lua-скриптом); якщо Redis вимкнено або недоступний,
+використовуються кошики в пам'яті процесу.
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.conf import messages
+from src.services.cache import MemoryRedis, redis_client
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class MemoryTokenBuckets:
+    """
+    Кошики token bucket у пам'яті процесу з обмеженою кількістю ключів.
+
+    :param maxsize: Максимальна кількість кошиків; найдавніше використані витісняються.
+    """
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RateLimiter:
+    """
+    Обмежувач частоти запитів за IP-адресою та email.
+
+    :param client: Клієнт Redis або :class:`MemoryRedis`.
+    """
+    prefix = "rl:"
+
+    def __init__(self, client):
+        self.client = client
+        self.memory = MemoryTokenBuckets()
+        self._script = None if isinstance(client, MemoryRedis) else client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, capacity: int, per_minute: float) -> float:
+        """
+        Взяти один токен з кошика.
+
+        :param key: Ключ кошика.
+        :param capacity: Місткість кошика.
+        :param per_minute: Кількість токенів, що додаються за хвилину.
+        :return: 0, якщо токен отримано, інакше кількість секунд до появи наступного токена.
+        """
+        rate = per_minute / 60
+        if self._script is not None:
+            try:
+                return float(await self._script(keys=[self.prefix + key], args=[capacity, rate]))
+            except RedisError as err:
+                logging.warning(err)
+        return self.memory.take(key, capacity, rate)
+
+    async def check(self, scope: str, request: Request, email: str | None = None) -> None:
+        """
+        Перевірити ліміти запитів для IP-адреси клієнта та, якщо задано, для email.
+
+        :param scope: Назва ендпоінта, для якого ведуться окремі кошики.
+        :param request: Об'єкт запиту.
+        :param email: Email з тіла запиту.
+        :raises HTTPException: 429 із заголовком ``Retry-After``, якщо ліміт вичерпано.
+        """
+        if not config.rate_limit_enabled:
+            return
+        ip = request.client.host if request.client else "unknown"
+        retry_after = await self.take(f"{scope}:ip:{ip}", config.rate_limit_ip_capacity,
+                                      config.rate_limit_ip_per_minute)
+        if email and not retry_after:
+            retry_after = await self.take(f"{scope}:email:{email.lower()}", config.rate_limit_email_capacity,
+                                          config.rate_limit_email_per_minute)
+        if retry_after:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=messages.TOO_MANY_REQUESTS,
+                                headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+
+rate_limiter = RateLimiter(redis_client)
@@ -0,0 +1,46 @@
+"""
+Модуль швидкої серіалізації списків користувачів у JSON.
+
+Списки з ``response_model=List[UserResponse]`` FastAPI перевіряє через pydantic з ``from_attributes``:
+для кожного рядка будується ``UserResponse`` і вкладений ``AccountResponseSchema``, потім словники,
+і лише потім JSON. Тут рядки ``repository.users.get_user_rows`` одразу перетворюються на словники
+тієї ж форми та кодуються orjson у байти.
+"""
+from typing import Iterable
+
+import orjson
+from fastapi import Response
+
+USER_FIELDS = ("id", "first_name", "last_name", "email", "phone_number", "birthday", "data", "created_at",
+               "updated_at")
+
+
+def users_json(rows: Iterable) -> bytes:
+    """
+    Закодувати рядки користувачів у JSON у формі ``List[UserResponse]``.
+
+    Вкладений обліковий запис будується один раз для кожного ``acc_id`` сторінки.
+
+    :param rows: Рядки з колонками ``repository.users.ROW_COLUMNS``.
+    :return: JSON-масив у байтах.
+    """
+    accounts: dict[int, dict] = {}
+    items = []
+    for row in rows:
+        acc = None
+        if row.acc_id is not None:
+            acc = accounts.get(row.acc_id)
+            if acc is None:
+                acc = accounts[row.acc_id] = {"id": row.acc_id, "username": row.acc_username,
+                                              "email": row.acc_email, "avatar": row.acc_avatar}
+        item = dict(zip(USER_FIELDS, row))
+        item["acc"] = acc
+        items.append(item)
+    return orjson.dumps(items)
+
+
+def json_response(content: bytes, headers: dict | None = None) -> Response:
+    """
+    Відповідь з уже закодованим JSON без повторної серіалізації.
+    """
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -0,0 +1,74 @@
+"""
+Модуль з кешем розкодованих JWT.
+
+Клієнт використовує той самий токен доступу до 60 хвилин, тому перевірку підпису та розбір claims
+можна виконати один раз і зберігати результат до ``exp`` токена.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+from src.conf.config import config
+from src.services.metrics import JWT_CACHE_REQUESTS
+
+
+class TokenCache:
+    """
+    LRU-кеш перевірених claims за хешем токена з обмеженим розміром.
+
+    :param maxsize: Максимальна кількість токенів у кеші; 0 вимикає кеш.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        """
+        Отримати claims токена, якщо він уже перевірявся і ще не прострочений.
+
+        :param token: JWT.
+        :return: Claims токена або None.
+        """
+        key = self._key(token)
+        payload = self._data.get(key)
+        if payload is not None and payload.get("exp", 0) <= time.time():
+            del self._data[key]
+            payload = None
+        if payload is None:
+            self.misses += 1
+            JWT_CACHE_REQUESTS.labels("miss").inc()
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        JWT_CACHE_REQUESTS.labels("hit").inc()
+        return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        """
+        Зберегти claims перевіреного токена.
+
+        :param token: JWT.
+        :param payload: Claims, отримані після перевірки підпису.
+        """
+        if self.maxsize <= 0 or "exp" not in payload:
+            return
+        key = self._key(token)
+        self._data[key] = payload
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(config.jwt_cache_size)
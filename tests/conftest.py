@@ -1,4 +1,8 @@
 import asyncio
+import os
+
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
 
 import pytest
 from fastapi.testclient import TestClient
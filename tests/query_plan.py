@@ -0,0 +1,54 @@
+"""
+Допоміжні функції для перевірки планів запитів репозиторію.
+
+Перехоплюють SQL, який репозиторій надсилає до бази, і виконують для нього EXPLAIN:
+``EXPLAIN QUERY PLAN`` на SQLite та ``EXPLAIN`` на PostgreSQL.
+"""
+import contextlib
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+FULL_SCAN_MARKERS = {
+    "sqlite": "SCAN {table}",
+    "postgresql": "Seq Scan on {table}",
+}
+
+
+@contextlib.contextmanager
+def capture_statements(engine: AsyncEngine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters) -> list[str]:
+    dialect = engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(prefix + statement, parameters)
+        rows = result.all()
+    if dialect == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+async def assert_no_full_scan(engine: AsyncEngine, statements, table: str):
+    """
+    Перевірити, що жоден з перехоплених запитів не читає таблицю повним скануванням.
+
+    Покривне сканування індексу на SQLite (``SCAN users USING INDEX``) теж вважається повним.
+    """
+    marker = FULL_SCAN_MARKERS[engine.dialect.name].format(table=table)
+    assert statements, "no statements captured"
+    for statement, parameters in statements:
+        plan = await explain(engine, statement, parameters)
+        scans = [line for line in plan if line.startswith(marker) or f" {marker}" in line]
+        assert not scans, f"full scan of {table}:\n{statement}\n" + "\n".join(plan)
@@ -0,0 +1,77 @@
+import asyncio
+import io
+import os
+
+import pytest
+from sqlalchemy import select, update
+
+from src.conf.config import config
+from src.database.models import Account
+from tests.conftest import TestingSessionLocal
+
+Image = pytest.importorskip("PIL.Image")
+
+acc_mock = {
+    "username": "avatars",
+    "email": "avatars@example.com",
+    "password": "secret1",
+}
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    response = client.post("/auth/signup", json=acc_mock)
+    assert response.status_code == 201, response.text
+
+    async def confirm():
+        async with TestingSessionLocal() as session:
+            await session.execute(update(Account).filter_by(email=acc_mock["email"]).values(confirmed=True))
+            await session.commit()
+
+    asyncio.run(confirm())
+    response = client.post("/auth/login", data={"username": acc_mock["email"], "password": acc_mock["password"]})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (120, 90), (10, 120, 200)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_signup_gravatar(headers):
+    async def avatar():
+        async with TestingSessionLocal() as session:
+            return await session.scalar(select(Account.avatar).filter_by(email=acc_mock["email"]))
+
+    assert asyncio.run(avatar()).startswith("https://www.gravatar.com/avatar/")
+
+
+def test_upload_avatar(client, headers, png):
+    response = client.patch("/api/accounts/avatar", files={"file": ("me.png", png, "image/png")}, headers=headers)
+    assert response.status_code == 200, response.text
+    url = response.json()["avatar"]
+    assert url.startswith("/static/avatars/") and url.endswith(f"-{config.avatar_default_size}.webp")
+    try:
+        static = client.get(url)
+        assert static.status_code == 200
+        assert static.headers["content-type"] == "image/webp"
+        assert "immutable" in static.headers["cache-control"]
+    finally:
+        digest = url.rsplit("/", 1)[1].rsplit("-", 1)[0]
+        directory = os.path.join(config.static_dir, "avatars")
+        for name in os.listdir(directory):
+            if name.startswith(digest):
+                os.remove(os.path.join(directory, name))
+
+
+def test_upload_not_an_image(client, headers):
+    response = client.patch("/api/accounts/avatar", files={"file": ("me.png", b"nope", "image/png")}, headers=headers)
+    assert response.status_code == 400, response.text
+
+
+def test_upload_unauthorized(client, png):
+    response = client.patch("/api/accounts/avatar", files={"file": ("me.png", png, "image/png")})
+    assert response.status_code == 401, response.text
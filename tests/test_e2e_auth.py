@@ -1,9 +1,15 @@
-from unittest.mock import MagicMock
+import os
+import tempfile
+from unittest.mock import patch
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
 
-from src.database.models import Account
+from src.database import db as database
+from src.database.db import Base, ReplicaRouter
+from src.database.models import Account, EmailOutbox, EmailStatus
+from src.services.cache import account_cache
 from tests.conftest import TestingSessionLocal
 from src.conf import messages
 
@@ -14,9 +20,7 @@ acc_mock = {
 }
 
 
-def test_create_acc(client, monkeypatch):
-    mock_send_email = MagicMock()
-    monkeypatch.setattr("src.services.email.send_email", mock_send_email)
+def test_create_acc(client):
     response = client.post("/auth/signup", json=acc_mock)
     assert response.status_code == 201, response.text
     data = response.json()
@@ -25,13 +29,25 @@ def test_create_acc(client, monkeypatch):
     assert "avatar" in data
 
 
-def test_repeat_create_acc(client, monkeypatch):
-    mock_send_email = MagicMock()
-    monkeypatch.setattr("src.services.email.send_email", mock_send_email)
+@pytest.mark.asyncio
+async def test_create_acc_enqueues_confirmation(client):
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(EmailOutbox).filter_by(recipient=acc_mock.get("email")))
+        message = result.scalar_one()
+    assert message.status == EmailStatus.pending
+    assert message.username == acc_mock.get("username")
+    assert message.host == "http://testserver/"
+
+
+@pytest.mark.asyncio
+async def test_repeat_create_acc(client):
     response = client.post("/auth/signup", json=acc_mock)
     assert response.status_code == 409, response.text
     data = response.json()
     assert data.get("detail") == messages.ACCOUNT_EXISTS
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(EmailOutbox).filter_by(recipient=acc_mock.get("email")))
+        assert len(result.scalars().all()) == 1
 
 
 def test_login_acc_not_confirmed(client, monkeypatch):
@@ -94,4 +110,88 @@ def test_login_wrong_email_acc(client, monkeypatch):
     )
     assert response.status_code == 401, response.text
     data = response.json()
-    assert data.get("detail") == messages.INVALID_EMAIL
\ No newline at end of file
+    assert data.get("detail") == messages.INVALID_EMAIL
+
+
+def login(client):
+    response = client.post(
+        "/auth/login",
+        data={
+            "username": acc_mock.get("email"),
+            "password": acc_mock.get("password"),
+        },
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def refresh(client, refresh_token):
+    return client.get("/auth/refresh_token", headers={"Authorization": f"Bearer {refresh_token}"})
+
+
+def test_refresh_token_rotation(client):
+    tokens = login(client)
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200, response.text
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_refresh_token_reuse_revokes_all(client):
+    tokens = login(client)
+    other_device = login(client)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    response = refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401, response.text
+    assert response.json().get("detail") == messages.INVALID_REFRESH_TOKEN
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+    assert refresh(client, other_device["refresh_token"]).status_code == 401
+
+
+def test_logout(client):
+    tokens = login(client)
+    other_device = login(client)
+    response = client.post("/auth/logout", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 204, response.text
+    assert refresh(client, other_device["refresh_token"]).status_code == 200
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_logout_all(client):
+    tokens = login(client)
+    other_device = login(client)
+    response = client.post("/auth/logout_all", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 204, response.text
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert refresh(client, other_device["refresh_token"]).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_current_acc_cached_from_primary(client):
+    tokens = login(client)
+    with tempfile.TemporaryDirectory() as tmp:
+        replica = create_engine(f"sqlite:///{os.path.join(tmp, 'replica.sqlite')}")
+        Base.metadata.create_all(replica)
+        with Session(replica) as session:
+            session.add(Account(username="stale", email=acc_mock.get("email"), password="x", confirmed=True))
+            session.commit()
+        replica.dispose()
+        router = ReplicaRouter([str(replica.url).replace("sqlite://", "sqlite+aiosqlite://")], retry_interval=30)
+        await account_cache.invalidate(acc_mock.get("email"))
+        try:
+            with patch.object(database, "replica_router", router):
+                response = client.get("/api/users/", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+            assert response.status_code == 200, response.text
+            cached = await account_cache.get(acc_mock.get("email"))
+            assert cached.username == acc_mock.get("username")
+        finally:
+            await account_cache.invalidate(acc_mock.get("email"))
+            await router.close()
+
+
+def test_jwks_symmetric(client):
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200, response.text
+    assert response.json() == {"keys": []}
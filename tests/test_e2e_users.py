@@ -0,0 +1,329 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from src.database.models import Account
+from tests.conftest import TestingSessionLocal
+
+acc_mock = {
+    "username": "contacts",
+    "email": "contacts@example.com",
+    "password": "secret1",
+}
+
+
+def user_payload(i: int) -> dict:
+    return {
+        "first_name": "Taras",
+        "last_name": f"Shevchenko{i}",
+        "email": f"taras{i}@ex.com",
+        "phone_number": f"38050{i:05d}",
+        "birthday": "09.03.1814",
+    }
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    response = client.post("/auth/signup", json=acc_mock)
+    assert response.status_code == 201, response.text
+
+    async def confirm():
+        async with TestingSessionLocal() as session:
+            await session.execute(update(Account).filter_by(email=acc_mock["email"]).values(confirmed=True))
+            await session.commit()
+
+    asyncio.run(confirm())
+    response = client.post("/auth/login", data={"username": acc_mock["email"], "password": acc_mock["password"]})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_create_users(client, headers):
+    for i in range(25):
+        response = client.post("/api/users/", json=user_payload(i), headers=headers)
+        assert response.status_code == 201, response.text
+        assert response.json()["last_name"] == f"Shevchenko{i}"
+
+
+def test_cursor_pagination(client, headers):
+    seen = []
+    response = client.get("/api/users/", params={"limit": 10}, headers=headers)
+    while True:
+        assert response.status_code == 200, response.text
+        seen.extend(user["id"] for user in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get("/api/users/", params={"limit": 10, "cursor": cursor}, headers=headers)
+    assert seen == sorted(seen)
+    assert len(seen) == 25
+
+
+def test_cursor_matches_offset(client, headers):
+    first = client.get("/api/users/", params={"limit": 10}, headers=headers)
+    by_cursor = client.get("/api/users/", params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]},
+                           headers=headers)
+    by_offset = client.get("/api/users/", params={"limit": 10, "offset": 10}, headers=headers)
+    assert by_cursor.json() == by_offset.json()
+
+
+def test_invalid_cursor(client, headers):
+    response = client.get("/api/users/", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400, response.text
+
+
+def test_sparse_fields(client, headers):
+    response = client.get("/api/users/", params={"limit": 10, "fields": "last_name,email"}, headers=headers)
+    assert response.status_code == 200, response.text
+    users = response.json()
+    assert len(users) == 10
+    assert set(users[0]) == {"id", "last_name", "email"}
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_sparse_fields_include_acc(client, headers):
+    response = client.get("/api/users/", params={"limit": 10, "fields": "first_name", "include": "acc"},
+                          headers=headers)
+    assert response.status_code == 200, response.text
+    user = response.json()[0]
+    assert set(user) == {"id", "first_name", "acc"}
+    assert user["acc"]["email"] == acc_mock["email"]
+
+
+def test_include_without_acc(client, headers):
+    full = client.get("/api/users/", params={"limit": 10}, headers=headers).json()
+    response = client.get("/api/users/", params={"limit": 10, "include": ""}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == [{key: value for key, value in user.items() if key != "acc"} for user in full]
+
+
+def test_get_user_fields(client, headers):
+    user_id = client.get("/api/users/", params={"limit": 10}, headers=headers).json()[0]["id"]
+    response = client.get(f"/api/users/{user_id}", params={"fields": "phone_number"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"id": user_id, "phone_number": "3805000000"}
+
+
+def test_unknown_fields(client, headers):
+    response = client.get("/api/users/", params={"fields": "password"}, headers=headers)
+    assert response.status_code == 400, response.text
+    response = client.get("/api/users/", params={"include": "owner"}, headers=headers)
+    assert response.status_code == 400, response.text
+
+
+def test_update_user(client, headers):
+    body = dict(user_payload(0), last_name="Kobzar", data=True)
+    response = client.put("/api/users/1", json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["last_name"] == "Kobzar"
+    assert data["data"] is True
+    assert data["acc"]["email"] == acc_mock["email"]
+
+
+def test_update_user_not_found(client, headers):
+    body = dict(user_payload(0), data=True)
+    response = client.put("/api/users/9999", json=body, headers=headers)
+    assert response.status_code == 404, response.text
+
+
+def test_delete_user(client, headers):
+    response = client.delete("/api/users/2", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] == 2
+    response = client.delete("/api/users/2", headers=headers)
+    assert response.status_code == 404, response.text
+    response = client.get("/api/users/2", headers=headers)
+    assert response.status_code == 404, response.text
+
+
+def test_list_not_modified(client, headers):
+    response = client.get("/api/users/", params={"limit": 10}, headers=headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    response = client.get("/api/users/", params={"limit": 10}, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304, response.text
+    assert response.headers["ETag"] == etag
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_list_etag_changes(client, headers):
+    etag = client.get("/api/users/", params={"limit": 10}, headers=headers).headers["ETag"]
+    sparse = client.get("/api/users/", params={"limit": 10, "fields": "email"}, headers=headers).headers["ETag"]
+    assert sparse != etag
+    response = client.delete("/api/users/3", headers=headers)
+    assert response.status_code == 200, response.text
+    response = client.get("/api/users/", params={"limit": 10}, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != etag
+
+
+def test_list_cache(client, headers):
+    from src.services.cache import user_list_cache
+
+    params = {"limit": 10, "offset": 0}
+    first = client.get("/api/users/", params=params, headers=headers)
+    hits = user_list_cache.hits
+    second = client.get("/api/users/", params=params, headers=headers)
+    assert user_list_cache.hits == hits + 1
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["content-type"] == "application/json"
+    response = client.get("/api/users/", params=params, headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304, response.text
+    assert user_list_cache.hits == hits + 2
+
+    data = not first.json()[0]["data"]
+    response = client.put("/api/users/1", json=dict(user_payload(0), last_name="Kobzar", data=data), headers=headers)
+    assert response.status_code == 200, response.text
+    third = client.get("/api/users/", params=params, headers=headers)
+    assert user_list_cache.hits == hits + 2
+    assert third.json()[0]["data"] is data
+
+
+def test_get_user_not_modified(client, headers):
+    response = client.get("/api/users/1", headers=headers)
+    etag = response.headers["ETag"]
+    response = client.get("/api/users/1", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304, response.text
+    response = client.get("/api/users/1", headers={**headers, "If-None-Match": 'W/"other"'})
+    assert response.status_code == 200, response.text
+
+
+def test_update_if_match(client, headers):
+    etag = client.get("/api/users/1", params={"fields": "email"}, headers=headers).headers["ETag"]
+    body = dict(user_payload(0), last_name="Kobzar", data=True)
+    response = client.put("/api/users/1", json=body, headers={**headers, "If-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.json()["last_name"] == "Kobzar"
+    assert response.headers["ETag"] == client.get("/api/users/1", headers=headers).headers["ETag"]
+
+
+def test_update_if_match_stale(client, headers):
+    stale = 'W/"u1-19700101000000000000"'
+    response = client.put("/api/users/1", json=dict(user_payload(0), data=True),
+                          headers={**headers, "If-Match": stale})
+    assert response.status_code == 412, response.text
+    assert client.get("/api/users/1", headers=headers).json()["last_name"] == "Kobzar"
+
+
+def test_delete_if_match_stale(client, headers):
+    response = client.delete("/api/users/4", headers={**headers, "If-Match": 'W/"u4-19700101000000000000"'})
+    assert response.status_code == 412, response.text
+    etag = client.get("/api/users/4", headers=headers).headers["ETag"]
+    response = client.delete("/api/users/4", headers={**headers, "If-Match": etag})
+    assert response.status_code == 200, response.text
+
+
+def test_search_ranks_name_prefix_first(client, headers):
+    response = client.get("/api/users/search", params={"q": "Ko"}, headers=headers)
+    assert response.status_code == 200, response.text
+    users = response.json()
+    assert users[0]["last_name"] == "Kobzar"
+    assert all("ko" in (user["last_name"] + user["email"]).lower() for user in users)
+    assert len(users) == 10
+
+
+def test_search_email_and_phone(client, headers):
+    response = client.get("/api/users/search", params={"q": "taras12@"}, headers=headers)
+    assert [user["last_name"] for user in response.json()] == ["Shevchenko12"]
+    response = client.get("/api/users/search", params={"q": "3805000013", "fields": "phone_number"}, headers=headers)
+    assert response.json() == [{"id": 14, "phone_number": "3805000013"}]
+
+
+def test_search_escapes_wildcards(client, headers):
+    response = client.get("/api/users/search", params={"q": "%"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == []
+
+
+def test_search_rejects_blank_query(client, headers):
+    response = client.get("/api/users/search", params={"q": "  \t "}, headers=headers)
+    assert response.status_code == 422, response.text
+
+
+def test_upcoming_birthdays(client, headers):
+    today = date.today()
+    for offset, name in ((30, "Later"), (3, "Soon"), (0, "Today")):
+        birthday = (today + timedelta(days=offset)).replace(year=2000)
+        body = dict(user_payload(0), last_name=name, birthday=birthday.strftime("%d.%m.%Y"))
+        response = client.post("/api/users/", json=body, headers=headers)
+        assert response.status_code == 201, response.text
+
+    response = client.get("/api/users/birthdays", params={"days": 7, "limit": 500}, headers=headers)
+    assert response.status_code == 200, response.text
+    names = [user["last_name"] for user in response.json()]
+    assert names.index("Today") < names.index("Soon")
+    assert "Later" not in names
+
+    response = client.get("/api/users/birthdays", params={"days": 0, "fields": "last_name"}, headers=headers)
+    assert {"id", "last_name"} == set(response.json()[0])
+    assert "Soon" not in [user["last_name"] for user in response.json()]
+
+
+def test_bulk_import_json(client, headers, monkeypatch):
+    monkeypatch.setattr("src.routes.users.config.bulk_insert_batch_size", 2)
+    items = [user_payload(100), user_payload(101), {"first_name": "x"}, user_payload(102)]
+    response = client.post("/api/users/bulk", json=items, headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["created"] == 3
+    assert data["failed"] == 1
+    results = data["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[2]["id"] is None and results[2]["errors"]
+    ids = [results[i]["id"] for i in (0, 1, 3)]
+    assert ids == sorted(ids)
+    response = client.get(f"/api/users/{ids[2]}", headers=headers)
+    assert response.json()["last_name"] == "Shevchenko102"
+
+
+def test_bulk_import_ndjson(client, headers):
+    lines = [json.dumps(user_payload(200)), "{not json", json.dumps(user_payload(201))]
+    response = client.post("/api/users/bulk", content="\n".join(lines) + "\n", headers={
+        **headers, "Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+    assert data["results"][1]["errors"]
+
+
+def test_bulk_import_not_array(client, headers):
+    response = client.post("/api/users/bulk", json=user_payload(300), headers=headers)
+    assert response.status_code == 400, response.text
+
+
+def test_export_ndjson(client, headers):
+    listed = client.get("/api/users/", params={"limit": 500}, headers=headers).json()
+    response = client.get("/api/users/export", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [user["id"] for user in listed]
+    assert rows[0]["last_name"] == listed[0]["last_name"]
+    assert rows[0]["created_at"] == listed[0]["created_at"]
+
+
+def test_export_csv(client, headers):
+    response = client.get("/api/users/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0]["id"] == "1"
+    assert rows[0]["last_name"] == "Kobzar"
+
+
+def test_export_unknown_format(client, headers):
+    response = client.get("/api/users/export", params={"format": "xml"}, headers=headers)
+    assert response.status_code == 422, response.text
+
+
+def test_export_all_forbidden(client, headers):
+    response = client.get("/api/users/all/export", headers=headers)
+    assert response.status_code == 403, response.text
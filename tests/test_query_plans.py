@@ -0,0 +1,85 @@
+import unittest
+from datetime import date
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
+from src.database.models import Account, User
+from src.repository import users as repository_users
+from src.schemas import UserUpdateSchema
+from tests.query_plan import capture_statements, assert_no_full_scan
+
+ACCOUNTS = 4
+USERS_PER_ACCOUNT = 250
+
+
+class TestUserQueryPlans(unittest.IsolatedAsyncioTestCase):
+    """
+    Запити репозиторію користувачів для одного облікового запису не повинні сканувати всю таблицю users.
+    """
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Account), [
+                {"id": i, "username": f"acc{i}", "email": f"acc{i}@ex.com", "password": "x"}
+                for i in range(1, ACCOUNTS + 1)
+            ])
+            await conn.execute(insert(User), [
+                {"first_name": "First", "last_name": f"Last{n}", "email": f"user{n}@ex.com",
+                 "phone_number": "0500000000", "birthday": "01.01.2000", "acc_id": n % ACCOUNTS + 1}
+                for n in range(ACCOUNTS * USERS_PER_ACCOUNT)
+            ])
+            await conn.exec_driver_sql("ANALYZE")
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+        self.acc = await self.session.get(Account, 2)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def assert_indexed(self, query):
+        with capture_statements(self.engine) as statements:
+            await query
+        statements = [(s, p) for s, p in statements if "users" in s]
+        await assert_no_full_scan(self.engine, statements, "users")
+
+    async def test_get_users(self):
+        await self.assert_indexed(repository_users.get_users(10, 100, self.session, self.acc))
+
+    async def test_get_users_cursor(self):
+        await self.assert_indexed(repository_users.get_users(10, 0, self.session, self.acc, after_id=400))
+
+    async def test_get_users_sparse(self):
+        with capture_statements(self.engine) as statements:
+            users = await repository_users.get_users(10, 0, self.session, self.acc, columns=["id", "last_name"],
+                                                     include_acc=False)
+        statement = next(s for s, p in statements if "users" in s)
+        self.assertNotIn("acc", statement.split("FROM", 1)[1].split("WHERE", 1)[0])
+        self.assertNotIn("users.phone_number", statement)
+        self.assertEqual(len(users), 10)
+        await assert_no_full_scan(self.engine, [(s, p) for s, p in statements if "users" in s], "users")
+
+    async def test_get_user_versions(self):
+        await self.assert_indexed(repository_users.get_user_versions(10, 0, self.session, self.acc, after_id=400))
+
+    async def test_search_users(self):
+        await self.assert_indexed(repository_users.search_users("last1", 10, 0, self.session, self.acc))
+
+    async def test_upcoming_birthdays_wrap(self):
+        await self.assert_indexed(repository_users.get_upcoming_birthdays(7, 10, 0, self.session, self.acc,
+                                                                          date(2023, 12, 28)))
+
+    async def test_get_user(self):
+        await self.assert_indexed(repository_users.get_user(5, self.session, self.acc))
+
+    async def test_update_user(self):
+        body = UserUpdateSchema(first_name="Test", last_name="Test", email="test@tes.com", phone_number="111111",
+                                birthday="09.09.1999", data=True)
+        await self.assert_indexed(repository_users.update_user(5, body, self.session, self.acc))
+
+    async def test_remove_user(self):
+        await self.assert_indexed(repository_users.remove_user(9, self.session, self.acc))
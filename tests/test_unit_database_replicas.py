@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import text
+from starlette.requests import Request
+
+from src.database import db as database
+from src.database.db import ReplicaRouter, WriteMarkerMiddleware, WRITE_MARKER_HEADER, get_read_db, recent_write
+
+
+def sqlite_file(directory: str, name: str) -> str:
+    path = os.path.join(directory, f"{name}.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE origin (name TEXT)")
+        conn.execute("INSERT INTO origin VALUES (?)", (name,))
+    return f"sqlite+aiosqlite:///{path}"
+
+
+def make_request(headers: dict | None = None) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/",
+                    "headers": [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]})
+
+
+async def origin(session) -> str:
+    return await session.scalar(text("SELECT name FROM origin"))
+
+
+class TestReplicaRouter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.urls = [sqlite_file(self.tmp.name, "replica_a"), sqlite_file(self.tmp.name, "replica_b")]
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    async def test_round_robin(self):
+        router = ReplicaRouter(self.urls, retry_interval=30)
+        seen = []
+        for _ in range(4):
+            async with router.session() as session:
+                seen.append(await origin(session))
+        await router.close()
+        self.assertEqual(seen, ["replica_a", "replica_b", "replica_a", "replica_b"])
+
+    async def test_unavailable_replica_is_skipped(self):
+        missing = f"sqlite+aiosqlite:///{self.tmp.name}/missing/replica.sqlite"
+        router = ReplicaRouter([missing, self.urls[1]], retry_interval=30)
+        seen = []
+        for _ in range(3):
+            async with router.session() as session:
+                seen.append(await origin(session))
+        self.assertEqual(seen, ["replica_b"] * 3)
+        self.assertGreater(router._down_until[0], time.monotonic())
+        await router.close()
+
+    async def test_no_replica_available(self):
+        router = ReplicaRouter([f"sqlite+aiosqlite:///{self.tmp.name}/missing/replica.sqlite"], retry_interval=30)
+        async with router.session() as session:
+            self.assertIsNone(session)
+        await router.close()
+
+
+class TestGetReadDb(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.primary = database.DatabaseSessionManager(sqlite_file(self.tmp.name, "primary"), name="test_primary")
+        self.router = ReplicaRouter([sqlite_file(self.tmp.name, "replica")], retry_interval=30)
+
+    async def asyncTearDown(self):
+        await self.router.close()
+        await self.primary.close()
+        self.tmp.cleanup()
+
+    async def read_origin(self, request: Request) -> str:
+        async with self.primary.session() as primary:
+            with patch.object(database, "replica_router", self.router):
+                dependency = get_read_db(request, primary)
+                session = await anext(dependency)
+                try:
+                    return await origin(session)
+                finally:
+                    await dependency.aclose()
+
+    async def test_reads_from_replica(self):
+        self.assertEqual(await self.read_origin(make_request()), "replica")
+
+    async def test_recent_write_reads_from_primary(self):
+        request = make_request({WRITE_MARKER_HEADER: f"{time.time():.3f}"})
+        self.assertEqual(await self.read_origin(request), "primary")
+
+    async def test_old_write_reads_from_replica(self):
+        request = make_request({WRITE_MARKER_HEADER: f"{time.time() - 3600:.3f}"})
+        self.assertEqual(await self.read_origin(request), "replica")
+
+    async def test_without_replicas_reads_from_primary(self):
+        self.router = ReplicaRouter([], retry_interval=30)
+        self.assertEqual(await self.read_origin(make_request()), "primary")
+
+
+class TestWriteMarker(unittest.IsolatedAsyncioTestCase):
+
+    def test_recent_write(self):
+        self.assertTrue(recent_write(str(time.time() - 1), 5))
+        self.assertFalse(recent_write(str(time.time() - 10), 5))
+        self.assertFalse(recent_write(None, 5))
+        self.assertFalse(recent_write("not a number", 5))
+
+    async def call(self, method: str, status: int) -> dict:
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": status, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        await WriteMarkerMiddleware(app)({"type": "http", "method": method}, None, send)
+        return dict(messages[0]["headers"])
+
+    async def test_marks_successful_writes(self):
+        headers = await self.call("POST", 201)
+        self.assertTrue(recent_write(headers[WRITE_MARKER_HEADER.lower().encode()].decode(), 5))
+
+    async def test_skips_reads_and_errors(self):
+        self.assertEqual(await self.call("GET", 200), {})
+        self.assertEqual(await self.call("PUT", 412), {})
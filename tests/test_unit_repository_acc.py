@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import Account
 from src.schemas import AccountSchema
 from src.repository.acc import get_acc_by_email, create_acc, update_token, confirmed_email
+from src.services.avatars import gravatar_url
 
 
 class TestAccountRepository(unittest.IsolatedAsyncioTestCase):
@@ -22,14 +23,12 @@ class TestAccountRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result, expected_account)
 
     async def test_create_acc(self):
-        account_schema = AccountSchema(email="test@example.com")
-        expected_account = Account(email=account_schema.email)
-        mock_gravatar = MagicMock()
-        mock_gravatar.get_image.return_value = None
-        Gravatar = MagicMock(return_value=mock_gravatar)
+        account_schema = AccountSchema(username="tester", email="test@example.com", password="secret1")
 
         result = await create_acc(account_schema, self.session)
         self.assertEqual(result.email, account_schema.email)
+        self.assertEqual(result.username, account_schema.username)
+        self.assertEqual(result.avatar, gravatar_url(account_schema.email))
         self.assertTrue(self.session.add.called)
         self.assertTrue(self.session.commit.called)
 
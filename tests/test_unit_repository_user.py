@@ -1,11 +1,19 @@
 import unittest
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
 
 from src.database.models import User, Account
 from src.schemas import UserSchema, UserUpdateSchema
-from src.repository.users import get_users, create_user, update_user
+from src.repository.users import (get_users, get_all_users, create_user, update_user, remove_user,
+                                  get_upcoming_birthdays, get_user_versions)
+from src.services.birthdays import birthday_fields
+from src.services.etag import list_etag, user_versions
 
 
 class TestAsync(unittest.IsolatedAsyncioTestCase):
@@ -38,16 +46,100 @@ class TestAsync(unittest.IsolatedAsyncioTestCase):
     async def test_update_user(self):
         body = UserUpdateSchema(first_name="Test", last_name="Test", email="test@tes.com", phone_number="111111",
                                 birthday="09.09.1999", data=True)
-        user = User(first_name="Test old", last_name="Test old", email="testold@tes.com", phone_number="222222",
-                    birthday="10.09.1999", data=False)
+        user = User(id=1, first_name="Test", last_name="Test", email="test@tes.com", phone_number="111111",
+                    birthday="09.09.1999", data=True)
         mock_user = MagicMock()
         mock_user.scalar_one_or_none.return_value = user
         self.session.execute.return_value = mock_user
 
         result = await update_user(user.id, body, self.session, self.acc)
-        self.assertEqual(result.first_name, body.first_name)
-        self.assertEqual(result.last_name, body.last_name)
-        self.assertEqual(result.email, body.email)
-        self.assertEqual(result.phone_number, body.phone_number)
-        self.assertEqual(result.birthday, body.birthday)
-        self.assertTrue(result.data, True)
+        self.assertEqual(self.session.execute.await_count, 1)
+        sq = self.session.execute.await_args.args[0]
+        self.assertTrue(sq.is_update)
+        params = sq.compile().params
+        self.assertEqual(params["first_name"], body.first_name)
+        self.assertEqual(params["last_name"], body.last_name)
+        self.assertEqual(params["email"], body.email)
+        self.assertEqual(params["phone_number"], body.phone_number)
+        self.assertEqual(params["birthday"], body.birthday)
+        self.assertEqual(params["data"], body.data)
+        self.assertIs(result, user)
+        self.assertIs(result.acc, self.acc)
+        self.assertTrue(self.session.commit.called)
+
+    async def test_update_user_not_found(self):
+        body = UserUpdateSchema(first_name="Test", last_name="Test", email="test@tes.com", phone_number="111111",
+                                birthday="09.09.1999", data=True)
+        mock_user = MagicMock()
+        mock_user.scalar_one_or_none.return_value = None
+        self.session.execute.return_value = mock_user
+
+        result = await update_user(1, body, self.session, self.acc)
+        self.assertIsNone(result)
+        self.assertFalse(self.session.commit.called)
+
+    async def test_remove_user(self):
+        user = User(id=1, first_name="Test", last_name="Test", email="test@tes.com", phone_number="111111",
+                    birthday="09.09.1999", data=True)
+        mock_user = MagicMock()
+        mock_user.scalar_one_or_none.return_value = user
+        self.session.execute.return_value = mock_user
+
+        result = await remove_user(user.id, self.session, self.acc)
+        self.assertEqual(self.session.execute.await_count, 1)
+        self.assertTrue(self.session.execute.await_args.args[0].is_delete)
+        self.assertIs(result, user)
+        self.assertTrue(self.session.commit.called)
+
+
+class TestUpcomingBirthdays(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Account), [{"id": 1, "username": "acc", "email": "acc@ex.com", "password": "x"}])
+            await conn.execute(insert(User), [
+                {"first_name": "First", "last_name": name, "email": f"{name}@ex.com", "phone_number": "0500000000",
+                 "birthday": birthday, **birthday_fields(birthday), "acc_id": 1}
+                for name, birthday in (("Jan10", "10.01.1990"), ("May4", "04.05.1990"), ("May10", "10.05.1990"))
+            ])
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+        self.acc = await self.session.get(Account, 1)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_whole_year_nearest_first(self):
+        users = await get_upcoming_birthdays(365, 10, 0, self.session, self.acc, date(2023, 5, 5))
+        self.assertEqual([user.last_name for user in users], ["May10", "Jan10", "May4"])
+
+    async def test_wrapping_window_nearest_first(self):
+        users = await get_upcoming_birthdays(10, 10, 0, self.session, self.acc, date(2023, 12, 31))
+        self.assertEqual([user.last_name for user in users], ["Jan10"])
+
+
+class TestUserVersions(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Account), [{"id": 1, "username": "acc", "email": "acc@ex.com", "password": "x"}])
+            await conn.execute(insert(User), [
+                {"first_name": "First", "last_name": f"Last{n}", "email": f"user{n}@ex.com",
+                 "phone_number": "0500000000", "birthday": "01.01.2000", "acc_id": acc_id}
+                for n, acc_id in enumerate((1, None, 1))
+            ])
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_users_without_account_keep_page_etag(self):
+        users = await get_all_users(10, 0, self.session)
+        versions = await get_user_versions(10, 0, self.session)
+        self.assertEqual([version.id for version in versions], [user.id for user in users])
+        self.assertEqual(list_etag(versions), list_etag(user_versions(users, include_acc=True)))
@@ -0,0 +1,105 @@
+import io
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from src.services import avatars
+from src.services.avatars import gravatar_url, render_avatar, store_avatar
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def image_bytes(width: int, height: int, color=(200, 30, 30), fmt: str = "PNG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class TestGravatarUrl(unittest.TestCase):
+
+    def test_matches_gravatar_hash(self):
+        self.assertEqual(gravatar_url(" A@b.com"), "https://www.gravatar.com/avatar/357a20e8c56e69d6f9734d23ef9517e8")
+        self.assertEqual(gravatar_url("a@b.com", 160),
+                         "https://www.gravatar.com/avatar/357a20e8c56e69d6f9734d23ef9517e8?size=160")
+
+    def test_cached(self):
+        gravatar_url.cache_clear()
+        gravatar_url("cached@example.com")
+        gravatar_url("cached@example.com")
+        self.assertEqual(gravatar_url.cache_info().hits, 1)
+
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class TestRenderAvatar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_square_thumbnails(self):
+        digest = render_avatar(image_bytes(300, 200), self.tmp.name, [40, 80])
+        for size in (40, 80):
+            with Image.open(os.path.join(self.tmp.name, f"{digest}-{size}.webp")) as image:
+                self.assertEqual(image.size, (size, size))
+                self.assertEqual(image.format, "WEBP")
+
+    def test_content_addressed(self):
+        first = render_avatar(image_bytes(64, 64), self.tmp.name, [40])
+        self.assertEqual(render_avatar(image_bytes(64, 64), self.tmp.name, [40]), first)
+        self.assertNotEqual(render_avatar(image_bytes(64, 64, (0, 0, 255)), self.tmp.name, [40]), first)
+        self.assertEqual(len(os.listdir(self.tmp.name)), 2)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            render_avatar(image_bytes(64, 64, fmt="BMP"), self.tmp.name, [40])
+        with self.assertRaises(ValueError):
+            render_avatar(image_bytes(64, 64, fmt="TIFF"), self.tmp.name, [40])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_concurrent_uploads_of_same_image(self):
+        data = image_bytes(256, 256, fmt="JPEG")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            digests = list(executor.map(lambda _: render_avatar(data, self.tmp.name, [40, 80, 160]), range(16)))
+        self.assertEqual(len(set(digests)), 1)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), [f"{digests[0]}-{size}.webp" for size in (160, 40, 80)])
+
+    def test_not_an_image(self):
+        with self.assertRaises(ValueError):
+            render_avatar(b"not an image", self.tmp.name, [40])
+
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class TestStoreAvatar(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static_dir = avatars.config.static_dir
+        avatars.config.static_dir = self.tmp.name
+
+    async def asyncTearDown(self):
+        avatars.config.static_dir = self.static_dir
+        self.tmp.cleanup()
+
+    async def test_returns_default_size_url(self):
+        url = await store_avatar(image_bytes(100, 100, fmt="JPEG"))
+        self.assertTrue(url.startswith("/static/avatars/"))
+        self.assertTrue(url.endswith(f"-{avatars.config.avatar_default_size}.webp"))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, url.removeprefix("/static/"))))
+
+    async def test_invalid_image(self):
+        with self.assertRaises(HTTPException) as ctx:
+            await store_avatar(b"GIF89a broken")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    async def test_too_large(self):
+        with self.assertRaises(HTTPException) as ctx:
+            await store_avatar(b"0" * (avatars.config.avatar_max_bytes + 1))
+        self.assertEqual(ctx.exception.status_code, 413)
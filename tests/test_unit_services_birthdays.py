@@ -0,0 +1,38 @@
+import unittest
+from datetime import date
+
+from src.services.birthdays import parse_birthday, day_of_year, birthday_fields, birthday_window
+
+
+class TestBirthdays(unittest.TestCase):
+
+    def test_parse_formats(self):
+        for value in ("09.03.1814", "1814-03-09", "09/03/1814", "09-03-1814", " 09.03.1814 "):
+            self.assertEqual(parse_birthday(value), date(1814, 3, 9))
+
+    def test_parse_invalid(self):
+        for value in (None, "", "tomorrow", "31.02.1990"):
+            self.assertIsNone(parse_birthday(value))
+
+    def test_day_of_year_leap_reference(self):
+        self.assertEqual(day_of_year(date(1990, 1, 1)), 1)
+        self.assertEqual(day_of_year(date(2000, 2, 29)), 60)
+        self.assertEqual(day_of_year(date(2001, 3, 1)), 61)
+        self.assertEqual(day_of_year(date(2001, 12, 31)), 366)
+
+    def test_birthday_fields(self):
+        self.assertEqual(birthday_fields("29.02.1996"), {"birth_date": date(1996, 2, 29), "birth_doy": 60})
+        self.assertEqual(birthday_fields("unknown"), {"birth_date": None, "birth_doy": None})
+
+    def test_window(self):
+        self.assertEqual(birthday_window(date(2024, 3, 10), 7), [(70, 77)])
+
+    def test_window_wraps_year(self):
+        self.assertEqual(birthday_window(date(2023, 12, 28), 7), [(363, 366), (1, 4)])
+
+    def test_window_non_leap_year(self):
+        # 28 лютого + 1 день у невисокосний рік — це 1 березня; 29 лютого теж потрапляє у вікно.
+        self.assertEqual(birthday_window(date(2023, 2, 28), 1), [(59, 61)])
+
+    def test_window_whole_year(self):
+        self.assertEqual(birthday_window(date(2023, 5, 5), 365), [(1, 366)])
@@ -0,0 +1,103 @@
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from redis.exceptions import ConnectionError
+from sqlalchemy import inspect
+
+from src.database.models import Account, Role
+from src.services.cache import AccountCache, MemoryRedis, UserListCache
+
+
+class TestAccountCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cache = AccountCache(MemoryRedis(), ttl=60)
+        self.acc = Account(id=1, username="tester", email="test@example.com", password="hash",
+                           refresh_token="token", avatar="avatar", role=Role.moderator, confirmed=True,
+                           created_at=datetime(2023, 8, 1, 10, 0), updated_at=datetime(2023, 8, 2, 11, 30))
+
+    async def test_get_miss(self):
+        self.assertIsNone(await self.cache.get(self.acc.email))
+
+    async def test_set_get(self):
+        await self.cache.set(self.acc)
+        result = await self.cache.get(self.acc.email)
+        self.assertEqual(result.id, self.acc.id)
+        self.assertEqual(result.username, self.acc.username)
+        self.assertEqual(result.role, Role.moderator)
+        self.assertTrue(result.confirmed)
+        self.assertEqual(result.updated_at, self.acc.updated_at)
+        self.assertTrue(inspect(result).detached)
+
+    async def test_secrets_not_cached(self):
+        raw = AccountCache.dumps(self.acc)
+        self.assertNotIn("hash", raw)
+        self.assertNotIn("token", raw)
+
+    async def test_invalidate(self):
+        await self.cache.set(self.acc)
+        await self.cache.invalidate(self.acc.email)
+        self.assertIsNone(await self.cache.get(self.acc.email))
+
+    async def test_ttl(self):
+        self.cache.ttl = -1
+        await self.cache.set(self.acc)
+        self.assertIsNone(await self.cache.get(self.acc.email))
+
+    async def test_redis_error_is_miss(self):
+        client = AsyncMock()
+        client.get.side_effect = ConnectionError()
+        client.set.side_effect = ConnectionError()
+        cache = AccountCache(client, ttl=60)
+        await cache.set(self.acc)
+        self.assertIsNone(await cache.get(self.acc.email))
+
+
+class TestMemoryRedisLRU(unittest.IsolatedAsyncioTestCase):
+
+    async def test_evicts_least_recently_used(self):
+        client = MemoryRedis(maxsize=2)
+        await client.set("a", "1")
+        await client.set("b", "2")
+        await client.get("a")
+        await client.set("c", "3")
+        self.assertEqual(await client.get("a"), b"1")
+        self.assertIsNone(await client.get("b"))
+        self.assertEqual(await client.get("c"), b"3")
+
+
+class TestUserListCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cache = UserListCache(MemoryRedis(), ttl=60)
+
+    async def test_set_get(self):
+        key = self.cache.key(1, await self.cache.generation(1), 10, 0, None)
+        self.assertIsNone(await self.cache.get(key))
+        await self.cache.set(key, 'W/"l1"', "cursor", b'[{"id":1}]')
+        self.assertEqual(await self.cache.get(key), ('W/"l1"', "cursor", b'[{"id":1}]'))
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+    async def test_invalidate_starts_new_generation(self):
+        generation = await self.cache.generation(1)
+        await self.cache.set(self.cache.key(1, generation, 10, 0, None), 'W/"l1"', None, b"[]")
+        await self.cache.invalidate(1)
+        new_generation = await self.cache.generation(1)
+        self.assertGreater(new_generation, generation)
+        self.assertIsNone(await self.cache.get(self.cache.key(1, new_generation, 10, 0, None)))
+        self.assertEqual(await self.cache.generation(2), 0)
+
+    async def test_no_cursor(self):
+        key = self.cache.key(1, 0, 10, 0, None)
+        await self.cache.set(key, 'W/"l1"', None, b"[]")
+        self.assertEqual(await self.cache.get(key), ('W/"l1"', None, b"[]"))
+
+    async def test_redis_error_bypasses_cache(self):
+        client = AsyncMock()
+        client.get.side_effect = ConnectionError()
+        client.set.side_effect = ConnectionError()
+        cache = UserListCache(client, ttl=60)
+        self.assertIsNone(await cache.generation(1))
+        await cache.invalidate(1)
+        self.assertIsNone(await cache.get("users:1:0:"))
@@ -0,0 +1,26 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.services.email import TemplateRenderer, conf, confirmation_renderer, CONFIRMATION_TEMPLATE
+
+
+class TestTemplateRenderer(unittest.TestCase):
+
+    def test_matches_jinja(self):
+        values = {"host": "http://localhost:8000/", "username": "tester", "token": "a.b.c"}
+        expected = conf.template_engine().get_template(CONFIRMATION_TEMPLATE).render(**values)
+        self.assertIsNotNone(confirmation_renderer.parts)
+        self.assertEqual(confirmation_renderer.render(**values), expected)
+
+    def test_escapes_values(self):
+        rendered = confirmation_renderer.render(host="http://localhost:8000/", username="<b>x</b>", token="t")
+        self.assertIn("&lt;b&gt;x&lt;/b&gt;", rendered)
+        self.assertNotIn("<b>x</b>", rendered)
+
+    def test_falls_back_to_jinja_for_filters(self):
+        with tempfile.TemporaryDirectory() as folder:
+            Path(folder, "upper.html").write_text("Hi {{ username|upper }} from {{ host }}")
+            renderer = TemplateRenderer(Path(folder), "upper.html", ("host", "username"))
+            self.assertIsNone(renderer.parts)
+            self.assertEqual(renderer.render(host="h", username="bob"), "Hi BOB from h")
@@ -0,0 +1,112 @@
+import socket
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
+from src.database.models import EmailOutbox, EmailStatus
+from src.repository import outbox as repository_outbox
+from src.services import email_worker
+from src.services.email_worker import process_batch
+
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestEmailWorker(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session_maker = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        async with self.session_maker() as db:
+            for i in range(3):
+                repository_outbox.enqueue_confirmation(f"user{i}@ex.com", f"user{i}", "http://test/", db)
+            await db.commit()
+        self.inbox = Inbox()
+        self.port = free_port()
+        self.controller = Controller(self.inbox, hostname="127.0.0.1", port=self.port)
+        self.controller.start()
+        self.config = patch.multiple("src.services.email_worker.config", mail_server="127.0.0.1", mail_port=self.port,
+                                     mail_ssl_tls=False, mail_starttls=False, mail_use_credentials=False,
+                                     email_batch_size=2)
+        self.config.start()
+
+    async def asyncTearDown(self):
+        self.config.stop()
+        self.controller.stop()
+        await self.engine.dispose()
+
+    async def outbox(self) -> list[EmailOutbox]:
+        async with self.session_maker() as db:
+            result = await db.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+            return list(result.scalars().all())
+
+    async def test_sends_in_batches(self):
+        async with self.session_maker() as db:
+            self.assertEqual(await process_batch(db), 2)
+            self.assertEqual(await process_batch(db), 1)
+            self.assertEqual(await process_batch(db), 0)
+        self.assertEqual(sorted(envelope.rcpt_tos[0] for envelope in self.inbox.messages),
+                         ["user0@ex.com", "user1@ex.com", "user2@ex.com"])
+        self.assertIn(b"http://test/auth/confirmed_email/", self.inbox.messages[0].content)
+        for message in await self.outbox():
+            self.assertEqual(message.status, EmailStatus.sent)
+            self.assertEqual(message.attempts, 1)
+            self.assertIsNotNone(message.sent_at)
+
+    async def test_retries_with_backoff(self):
+        with patch("src.services.email_worker.config.mail_port", free_port()):
+            async with self.session_maker() as db:
+                self.assertEqual(await process_batch(db), 2)
+                self.assertEqual(await process_batch(db), 1)
+                self.assertEqual(await process_batch(db), 0)
+        for message in await self.outbox():
+            self.assertEqual(message.status, EmailStatus.pending)
+            self.assertEqual(message.attempts, 1)
+            self.assertIsNotNone(message.last_error)
+            self.assertGreater(message.next_attempt_at, datetime.utcnow())
+
+    async def test_closes_connection_when_login_fails(self):
+        clients = []
+
+        def smtp_client():
+            clients.append(email_worker.aiosmtplib.SMTP(hostname="127.0.0.1", port=self.port))
+            return clients[-1]
+
+        with patch("src.services.email_worker.smtp_client", smtp_client), \
+                patch("src.services.email_worker.config.mail_use_credentials", True):
+            async with self.session_maker() as db:
+                self.assertEqual(await process_batch(db), 2)
+        self.assertEqual(len(clients), 1)
+        self.assertFalse(clients[0].is_connected)
+        self.assertEqual(self.inbox.messages, [])
+        for message in (await self.outbox())[:2]:
+            self.assertEqual(message.status, EmailStatus.pending)
+            self.assertIn("AUTH", message.last_error)
+
+    def test_gives_up_after_max_attempts(self):
+        message = EmailOutbox(attempts=0, status=EmailStatus.pending)
+        repository_outbox.mark_failed(message, "error", max_attempts=2, base_delay=10, max_delay=60)
+        self.assertEqual(message.status, EmailStatus.pending)
+        repository_outbox.mark_failed(message, "error", max_attempts=2, base_delay=10, max_delay=60)
+        self.assertEqual(message.status, EmailStatus.failed)
+        self.assertEqual(message.attempts, 2)
@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.services.instrumentation import MetricsMiddleware, instrument_engine
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        instrument_engine(self.engine)
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/probe/{item_id}")
+        async def probe(item_id: int):
+            async with self.engine.connect() as conn:
+                for _ in range(3):
+                    await conn.execute(text("SELECT 1"))
+            return {"item_id": item_id}
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        asyncio.run(self.engine.dispose())
+
+    def test_route_latency_and_sql_per_request(self):
+        route = "/probe/{item_id}"
+        requests = sample("http_request_seconds_count", method="GET", route=route, status="200")
+        statements = sample("sql_statements_per_request_sum", route=route)
+        for item_id in (1, 2):
+            self.assertEqual(self.client.get(f"/probe/{item_id}").status_code, 200)
+        self.assertEqual(sample("http_request_seconds_count", method="GET", route=route, status="200"), requests + 2)
+        self.assertEqual(sample("sql_statements_per_request_sum", route=route), statements + 6)
+        self.assertEqual(sample("http_requests_in_flight"), 0)
+
+    def test_unmatched_route(self):
+        before = sample("http_request_seconds_count", method="GET", route="unmatched", status="404")
+        self.assertEqual(self.client.get("/missing").status_code, 404)
+        self.assertEqual(sample("http_request_seconds_count", method="GET", route="unmatched", status="404"),
+                         before + 1)
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from jose import jwt, JWTError
+
+from src.services.auth import Auth
+from src.services.keys import KeyRing
+
+
+class TestKeyRing(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+        self.keyring = KeyRing(self.directory, "RS256", rotation_days=30, retention_days=8, reload_interval=0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def age(self, kid: str, days: float):
+        for path in self.directory.glob(f"{kid}*.pem"):
+            created_at = time.time() - days * 86400
+            os.utime(path, (created_at, created_at))
+
+    def test_generates_key_on_first_use(self):
+        key = self.keyring.active
+        self.assertTrue((self.directory / f"{key.kid}.pem").exists())
+        self.assertEqual(self.keyring.active.kid, key.kid)
+
+    def test_jwks(self):
+        key = self.keyring.active
+        jwks = self.keyring.jwks()
+        self.assertEqual(len(jwks["keys"]), 1)
+        data = jwks["keys"][0]
+        self.assertEqual(data["kid"], key.kid)
+        self.assertEqual(data["kty"], "RSA")
+        self.assertEqual(data["alg"], "RS256")
+        self.assertNotIn("d", data)
+
+    def test_verify_with_published_key(self):
+        key = self.keyring.active
+        token = jwt.encode({"sub": "a"}, key.private_key, algorithm="RS256", headers={"kid": key.kid})
+        public = self.keyring.jwks()["keys"][0]
+        self.assertEqual(jwt.decode(token, public, algorithms=["RS256"])["sub"], "a")
+
+    def test_rotate_keeps_fresh_key(self):
+        key = self.keyring.active
+        self.assertEqual(self.keyring.rotate().kid, key.kid)
+
+    def test_rotate_retires_old_key(self):
+        old = self.keyring.active
+        self.age(old.kid, 31)
+        new = self.keyring.rotate()
+        self.assertNotEqual(new.kid, old.kid)
+        self.assertFalse((self.directory / f"{old.kid}.pem").exists())
+        self.assertTrue((self.directory / f"{old.kid}.pub.pem").exists())
+        retired = self.keyring.get(old.kid)
+        self.assertIsNotNone(retired)
+        self.assertIsNone(retired.private_key)
+        self.assertEqual(len(self.keyring.jwks()["keys"]), 2)
+
+    def test_rotate_prunes_expired_key(self):
+        old = self.keyring.active
+        self.age(old.kid, 40)
+        middle = self.keyring.rotate()
+        self.age(middle.kid, 31)
+        newest = self.keyring.rotate()
+        self.assertIsNone(self.keyring.get(old.kid))
+        self.assertIsNotNone(self.keyring.get(middle.kid))
+        self.assertEqual(self.keyring.active.kid, newest.kid)
+
+    def test_ec_keys(self):
+        keyring = KeyRing(self.directory, "ES256", rotation_days=30, retention_days=8, reload_interval=0)
+        self.assertEqual(keyring.jwks()["keys"], [])
+        keyring.active
+        self.assertEqual(keyring.jwks()["keys"][0]["crv"], "P-256")
+
+    def test_unsupported_algorithm(self):
+        with self.assertRaises(ValueError):
+            KeyRing(self.directory, "HS256", rotation_days=30, retention_days=8)
+
+
+class TestAuthAsymmetric(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.keyring = KeyRing(self.tmp.name, "RS256", rotation_days=30, retention_days=8, reload_interval=0)
+        self.auth = Auth()
+        self.auth.keyring = self.keyring
+        self.auth.ALGORITHM = "RS256"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_refresh_token_roundtrip(self):
+        token = await self.auth.create_refresh_token(data={"sub": "test@example.com"})
+        self.assertEqual(jwt.get_unverified_header(token)["kid"], self.keyring.active.kid)
+        self.assertEqual(await self.auth.decode_refresh_token(token), "test@example.com")
+
+    async def test_old_key_still_verifies(self):
+        token = await self.auth.create_refresh_token(data={"sub": "test@example.com"})
+        old = self.keyring.active
+        created_at = time.time() - 31 * 86400
+        os.utime(Path(self.tmp.name) / f"{old.kid}.pem", (created_at, created_at))
+        self.keyring.rotate()
+        self.assertNotEqual(jwt.get_unverified_header(token)["kid"], self.keyring.active.kid)
+        self.assertEqual(await self.auth.decode_refresh_token(token), "test@example.com")
+
+    def test_unknown_kid(self):
+        token = jwt.encode({"sub": "a"}, "secret", algorithm="HS256", headers={"kid": "missing"})
+        with self.assertRaises(JWTError):
+            self.auth._decode(token)
+
+    def test_symmetric_token_rejected(self):
+        self.keyring.active
+        token = jwt.encode({"sub": "a"}, "secret", algorithm="HS256")
+        with self.assertRaises(JWTError):
+            self.auth._decode(token)
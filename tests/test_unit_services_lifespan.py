@@ -0,0 +1,89 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.conf.config import config
+from src.database import db as database
+from src.database.db import Base, DatabaseSessionManager, InstrumentedQueuePool, ReplicaRouter
+from src.services import lifespan as app_lifespan
+from src.services.lifespan import InFlightMiddleware, InFlightTracker, warm_pool, warm_statements
+from src.services.passwords import PasswordHashingPool
+
+
+class TestInFlightTracker(unittest.IsolatedAsyncioTestCase):
+
+    async def test_drain(self):
+        tracker = InFlightTracker()
+        self.assertTrue(await tracker.drain(0.01))
+        tracker.started()
+        self.assertFalse(await tracker.drain(0.01))
+        asyncio.get_running_loop().call_later(0.01, tracker.finished)
+        self.assertTrue(await tracker.drain(1))
+        self.assertEqual(tracker.count, 0)
+
+    async def test_middleware_counts_requests(self):
+        tracker = InFlightTracker()
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(tracker.count)
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            await InFlightMiddleware(app, tracker)({"type": "http"}, None, None)
+        self.assertEqual(seen, [1])
+        self.assertEqual(tracker.count, 0)
+
+
+class TestWarmup(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self.tmp.name, 'warmup.sqlite')}"
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    async def test_warm_pool_prefills_connections(self):
+        engine = create_async_engine(self.url, poolclass=InstrumentedQueuePool, pool_size=3, max_overflow=0)
+        self.assertEqual(await warm_pool(engine, 3), 3)
+        self.assertEqual(engine.sync_engine.pool.checkedin(), 3)
+        await engine.dispose()
+
+    async def test_warm_statements(self):
+        manager = DatabaseSessionManager(self.url, name="warmup")
+        async with manager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with manager.session() as db:
+            await warm_statements(db)
+            self.assertFalse(db.in_transaction())
+        await manager.close()
+
+    async def test_lifespan_warms_up_and_shuts_down(self):
+        manager = DatabaseSessionManager(self.url, name="warmup")
+        async with manager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        pool = PasswordHashingPool("thread", workers=2, max_queue=2)
+        stopped = asyncio.Event()
+
+        async def run_worker(stop):
+            await stop.wait()
+            stopped.set()
+
+        with patch.object(database, "sessionmanager", manager), \
+                patch.object(database, "replica_router", ReplicaRouter([], retry_interval=30)), \
+                patch.object(app_lifespan.passwords, "password_pool", pool), \
+                patch.object(app_lifespan.email_worker, "run_worker", run_worker), \
+                patch.object(config, "email_worker_embedded", True), \
+                patch.object(config, "db_pool_warmup", 2), \
+                self.assertNoLogs(app_lifespan.logger, level="WARNING"):
+            async with app_lifespan.lifespan(None):
+                self.assertEqual(pool.completed, 2)
+                self.assertFalse(stopped.is_set())
+        self.assertTrue(stopped.is_set())
+        self.assertIsNone(manager.engine)
+        self.assertIsNone(pool._executor)
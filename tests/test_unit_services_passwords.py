@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import unittest
+
+from fastapi import HTTPException
+
+from src.services.passwords import PasswordHashingPool, hash_password, verify_password
+
+
+class TestPasswordHashingPool(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.pool = PasswordHashingPool("thread", workers=1, max_queue=1)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    async def test_hash_and_verify(self):
+        hashed = await self.pool.run(hash_password, "secret")
+        self.assertTrue(await self.pool.run(verify_password, "secret", hashed))
+        self.assertFalse(await self.pool.run(verify_password, "wrong", hashed))
+        self.assertEqual(self.pool.stats()["completed"], 3)
+
+    async def test_rejects_when_queue_full(self):
+        release = threading.Event()
+        running = [asyncio.create_task(self.pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        self.assertEqual(self.pool.queue_depth, 1)
+        with self.assertRaises(HTTPException) as ctx:
+            await self.pool.run(release.wait)
+        self.assertEqual(ctx.exception.status_code, 503)
+        release.set()
+        await asyncio.gather(*running)
+        stats = self.pool.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["max_queue_depth"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            PasswordHashingPool("fiber", workers=1, max_queue=1)
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+from fastapi import HTTPException
+
+from src.services.cache import MemoryRedis
+from src.services.rate_limit import RateLimiter
+
+
+def request(ip: str = "10.0.0.1"):
+    req = MagicMock()
+    req.client.host = ip
+    return req
+
+
+class RateLimiterCase:
+    client_factory: type
+
+    def setUp(self):
+        self.limiter = RateLimiter(self.client_factory())
+        self.config = patch.multiple("src.services.rate_limit.config", rate_limit_enabled=True,
+                                     rate_limit_ip_capacity=3, rate_limit_ip_per_minute=6,
+                                     rate_limit_email_capacity=2, rate_limit_email_per_minute=1)
+        self.config.start()
+
+    def tearDown(self):
+        self.config.stop()
+
+    async def test_ip_bucket(self):
+        for _ in range(3):
+            await self.limiter.check("login", request())
+        with self.assertRaises(HTTPException) as ctx:
+            await self.limiter.check("login", request())
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(ctx.exception.headers["Retry-After"], "10")
+        await self.limiter.check("login", request("10.0.0.2"))
+        await self.limiter.check("signup", request())
+
+    async def test_email_bucket(self):
+        await self.limiter.check("login", request("10.0.0.1"), "user@ex.com")
+        await self.limiter.check("login", request("10.0.0.2"), "USER@ex.com")
+        with self.assertRaises(HTTPException) as ctx:
+            await self.limiter.check("login", request("10.0.0.3"), "user@ex.com")
+        self.assertEqual(ctx.exception.headers["Retry-After"], "60")
+
+    async def test_disabled(self):
+        with patch("src.services.rate_limit.config.rate_limit_enabled", False):
+            for _ in range(10):
+                await self.limiter.check("login", request())
+
+
+class TestRedisRateLimiter(RateLimiterCase, unittest.IsolatedAsyncioTestCase):
+    client_factory = fakeredis.FakeAsyncRedis
+
+
+class TestMemoryRateLimiter(RateLimiterCase, unittest.IsolatedAsyncioTestCase):
+    client_factory = MemoryRedis
@@ -0,0 +1,61 @@
+import unittest
+from datetime import datetime
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.db import Base
+from src.database.models import Account, User
+from src.repository import users as repository_users
+from src.schemas import UserResponse
+from src.services.etag import list_etag, row_versions, user_versions
+from src.services.serialization import users_json
+
+
+class TestUsersJson(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Account), [
+                {"id": i, "username": f"acc{i}", "email": f"acc{i}@ex.com", "password": "x", "avatar": f"avatar{i}",
+                 "updated_at": datetime(2023, 8, i, 12, 30, 15, 123456)}
+                for i in (1, 2)
+            ])
+            await conn.execute(insert(User), [
+                {"first_name": "First", "last_name": f"Last{n}", "email": f"user{n}@ex.com",
+                 "phone_number": "0500000000", "birthday": "01.01.2000", "data": n % 2 == 0,
+                 "created_at": datetime(2023, 8, 1, 10, n), "updated_at": datetime(2023, 8, 2, 11, n, 5, n * 1000),
+                 "acc_id": n % 2 + 1 if n else None}
+                for n in range(20)
+            ])
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_matches_response_model(self):
+        users = await repository_users.get_all_users(500, 0, self.session)
+        adapter = TypeAdapter(List[UserResponse])
+        expected = adapter.dump_python(adapter.validate_python(users, from_attributes=True), mode="json")
+        rows = await repository_users.get_user_rows(500, 0, self.session)
+        self.assertEqual(orjson.loads(users_json(rows)), expected)
+
+    async def test_account_filter_and_page(self):
+        acc = await self.session.get(Account, 2)
+        rows = await repository_users.get_user_rows(5, 0, self.session, acc, after_id=3)
+        self.assertEqual([row.id for row in rows], [4, 6, 8, 10, 12])
+        self.assertTrue(all(item["acc"]["username"] == "acc2" for item in orjson.loads(users_json(rows))))
+
+    async def test_etag_matches_orm_path(self):
+        users = await repository_users.get_all_users(500, 0, self.session)
+        rows = await repository_users.get_user_rows(500, 0, self.session)
+        versions = await repository_users.get_user_versions(500, 0, self.session)
+        self.assertEqual(list_etag(row_versions(rows)), list_etag(user_versions(users, include_acc=True)))
+        self.assertEqual(list_etag(row_versions(rows)), list_etag(versions))
@@ -0,0 +1,36 @@
+import time
+import unittest
+
+from src.services.token_cache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TokenCache(maxsize=2)
+        self.payload = {"sub": "test@example.com", "scope": "access_token", "exp": int(time.time()) + 60}
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(self.cache.get("token"))
+        self.cache.set("token", self.payload)
+        self.assertEqual(self.cache.get("token"), self.payload)
+        self.assertEqual(self.cache.stats(), {"size": 1, "maxsize": 2, "hits": 1, "misses": 1})
+
+    def test_expired(self):
+        self.cache.set("token", dict(self.payload, exp=int(time.time()) - 1))
+        self.assertIsNone(self.cache.get("token"))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_lru_eviction(self):
+        self.cache.set("a", self.payload)
+        self.cache.set("b", self.payload)
+        self.cache.get("a")
+        self.cache.set("c", self.payload)
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_disabled(self):
+        cache = TokenCache(maxsize=0)
+        cache.set("token", self.payload)
+        self.assertIsNone(cache.get("token"))